@@ -0,0 +1,169 @@
+"""Time the dashboard's hot queries against a synthetic SQLite database,
+before and after the declared secondary indexes are created.
+
+    python -m benchmarks.dashboard_queries --games 1230
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, insert, text
+from nba_stats_collector.models import (
+    Base,
+    GameHeaders,
+    PlayerStatsByGame,
+    TeamStatsByGame,
+    ThreePoint,
+    TwoPoint,
+)
+from nba_stats_collector.schema import create_missing_indexes
+
+team_ids = list(range(1610612737, 1610612767))
+players_per_team = 15
+shots_per_game = 170
+
+queries = {
+    "player_stats_by_game(player_id)": (
+        "select * from player_stats_by_game where player_id = :player_id",
+        "player_id",
+    ),
+    "player shots (personId)": (
+        """
+        select "personId", x, y, "shotResult" from two_point where "personId" = :player_id
+        union all
+        select "personId", x, y, "shotResult" from threepoint where "personId" = :player_id
+        """,
+        "player_id",
+    ),
+    "team_stats_by_game(team_id)": (
+        "select * from team_stats_by_game where team_id = :team_id",
+        "team_id",
+    ),
+    "game_headers(team, date)": (
+        """
+        select game_id, game_date_est from game_headers
+        where home_team_id = :team_id or visitor_team_id = :team_id
+        order by game_date_est
+        """,
+        "team_id",
+    ),
+}
+
+
+def player_ids(team_id):
+    return [team_id * 100 + number for number in range(players_per_team)]
+
+
+def populate(engine, games):
+    rng = random.Random(0)
+    start_date = datetime(2022, 10, 18)
+    headers, player_stats, team_stats, two_points, three_points = [], [], [], [], []
+
+    for game_number in range(games):
+        game_id = f"00222{game_number:05d}"
+        home_team_id, visitor_team_id = rng.sample(team_ids, 2)
+        headers.append(
+            {
+                "game_date_est": start_date + timedelta(days=game_number // 7),
+                "game_sequence": game_number % 7,
+                "game_id": game_id,
+                "game_status_id": 3,
+                "game_status_text": "Final",
+                "gamecode": game_id,
+                "home_team_id": home_team_id,
+                "visitor_team_id": visitor_team_id,
+                "season": "2022",
+                "live_period": 4,
+                "wh_status": 1,
+            }
+        )
+        game_players = []
+        for team_id in (home_team_id, visitor_team_id):
+            team_stats.append({"game_id": game_id, "team_id": team_id, "pts": 110})
+            for player_id in player_ids(team_id):
+                game_players.append(player_id)
+                player_stats.append(
+                    {
+                        "game_id": game_id,
+                        "player_id": player_id,
+                        "team_id": team_id,
+                        "player_name": f"Player {player_id}",
+                        "start_position": "",
+                        "comment": "",
+                        "pts": rng.randint(0, 40),
+                    }
+                )
+        for action_number in range(shots_per_game):
+            shot = {
+                "game_id": game_id,
+                "actionNumber": action_number,
+                "personId": rng.choice(game_players),
+                "x": rng.uniform(0, 100),
+                "y": rng.uniform(0, 100),
+                "shotResult": rng.choice(["Made", "Missed"]),
+            }
+            (two_points if action_number % 3 else three_points).append(shot)
+
+    with engine.begin() as connection:
+        for table_model, rows in (
+            (GameHeaders, headers),
+            (PlayerStatsByGame, player_stats),
+            (TeamStatsByGame, team_stats),
+            (TwoPoint, two_points),
+            (ThreePoint, three_points),
+        ):
+            connection.execute(insert(table_model.__table__), rows)
+
+
+def time_queries(engine, repeat):
+    rng = random.Random(1)
+    parameters = {
+        "player_id": [
+            rng.choice(player_ids(rng.choice(team_ids))) for _ in range(repeat)
+        ],
+        "team_id": [rng.choice(team_ids) for _ in range(repeat)],
+    }
+    timings = {}
+    with engine.connect() as connection:
+        for name, (query, parameter) in queries.items():
+            statement = text(query)
+            start = time.perf_counter()
+            for value in parameters[parameter]:
+                connection.execute(statement, {parameter: value}).all()
+            timings[name] = (time.perf_counter() - start) / repeat * 1000
+    return timings
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=1230)
+    parser.add_argument("--repeat", type=int, default=50)
+    parsed = parser.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(engine)
+        populate(engine, parsed.games)
+
+        before = time_queries(engine, parsed.repeat)
+        create_missing_indexes(engine)
+        after = time_queries(engine, parsed.repeat)
+        engine.dispose()
+
+    print(f"{parsed.games} games, mean of {parsed.repeat} runs")
+    print(f"{'query':<36}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name in queries:
+        print(
+            f"{name:<36}{before[name]:>12.3f}{after[name]:>12.3f}"
+            f"{before[name] / after[name]:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
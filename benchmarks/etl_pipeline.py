@@ -0,0 +1,196 @@
+"""Time the ETL end to end by replaying recorded NBA API payloads for N
+synthetic games into a temporary SQLite database, without network access.
+
+    python -m benchmarks.etl_pipeline --games 15 --latency-ms 50
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from unittest import mock
+from nba_stats_collector import etl, nba_api_client
+from nba_stats_collector.etl import NBAStatsETL
+
+fixtures_dir = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "fixtures")
+recorded_game_id = "0022201130"
+game_date = date(2023, 4, 9)
+
+
+def read_fixture(name):
+    with open(os.path.join(fixtures_dir, name), "r") as file:
+        return file.read()
+
+
+def synthetic_game_ids(games):
+    return [f"00222{number:05d}" for number in range(1, games + 1)]
+
+
+def synthetic_scoreboard(game_ids):
+    """Clone the recorded game's scoreboard rows once per synthetic game."""
+    payload = json.loads(read_fixture("scoreboard.json"))
+    for result_set in payload["resultSets"]:
+        headers = [header.lower() for header in result_set["headers"]]
+        if "game_id" not in headers:
+            continue
+        game_id_position = headers.index("game_id")
+        recorded_rows = [
+            row
+            for row in result_set["rowSet"]
+            if row[game_id_position] == recorded_game_id
+        ]
+        rows = []
+        for sequence, game_id in enumerate(game_ids, start=1):
+            for recorded_row in recorded_rows:
+                row = list(recorded_row)
+                row[game_id_position] = game_id
+                if "game_status_id" in headers:
+                    row[headers.index("game_status_id")] = 3
+                if "game_sequence" in headers:
+                    row[headers.index("game_sequence")] = sequence
+                rows.append(row)
+        result_set["rowSet"] = rows
+    return payload
+
+
+class ReplayTimer:
+    """Transport that replays fixtures, timing each request.
+
+    The decode time, plus ``latency`` seconds of simulated network wait, is
+    summed over every request as the HTTP stage time.
+    """
+
+    def __init__(self, scoreboard_payload, latency=0.0):
+        self.scoreboard_payload = scoreboard_payload
+        self.latency = latency
+        self.raw_payloads = {
+            "BoxScoreTraditionalV2": read_fixture("boxscore.json"),
+            "PlayByPlay": read_fixture("playbyplay.json"),
+        }
+        self.requests = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, endpoint_class, params):
+        start = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        if endpoint_class.__name__ == "Scoreboard":
+            payload = json.loads(json.dumps(self.scoreboard_payload))
+        else:
+            payload = json.loads(
+                self.raw_payloads[endpoint_class.__name__].replace(
+                    recorded_game_id, params["game_id"]
+                )
+            )
+        with self._lock:
+            self.requests += 1
+            self.seconds += time.perf_counter() - start
+        return payload
+
+
+class TimedETL(NBAStatsETL):
+    """NBAStatsETL that records rows and seconds spent per table."""
+
+    def __init__(self, *args, **kwargs):
+        self.table_rows = defaultdict(int)
+        self.table_seconds = defaultdict(float)
+        super().__init__(*args, **kwargs)
+
+    def commit_data(self, data_list, table_model, on_conflict=None):
+        start = time.perf_counter()
+        counter = super().commit_data(data_list, table_model, on_conflict)
+        self.table_seconds[table_model.__tablename__] += time.perf_counter() - start
+        self.table_rows[table_model.__tablename__] += counter or 0
+        return counter
+
+
+def run(games, latency=0.0, **etl_options):
+    game_ids = synthetic_game_ids(games)
+    timer = ReplayTimer(synthetic_scoreboard(game_ids), latency)
+
+    with tempfile.TemporaryDirectory() as directory, mock.patch.object(
+        nba_api_client, "response_cache", None
+    ), mock.patch.object(
+        etl, "DATABASE_URL", f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    ):
+        nba_stats_etl = TimedETL(
+            game_date=game_date,
+            requests_per_second=0,
+            parquet_export_dir="",
+            transport=timer,
+            **etl_options,
+        )
+        start = time.perf_counter()
+        for keyword in nba_stats_etl.game_day_data_config:
+            nba_stats_etl.store_game_day_data(keyword)
+        nba_stats_etl.store_games_data()
+        seconds = time.perf_counter() - start
+        nba_stats_etl.engine.dispose()
+
+    return {
+        "games": games,
+        "seconds": seconds,
+        "rows": sum(nba_stats_etl.table_rows.values()),
+        "failed_rows": sum(nba_stats_etl.failed_rows.values()),
+        "table_rows": dict(nba_stats_etl.table_rows),
+        "table_seconds": dict(nba_stats_etl.table_seconds),
+        "http_requests": timer.requests,
+        "http_seconds": timer.seconds,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_memory_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=15)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--write-mode", default="bulk", choices=["bulk", "orm"])
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--json", action="store_true", help="Print the raw results.")
+    parsed = parser.parse_args(args)
+    # The per-commit log lines would dominate the output
+    logging.getLogger("nba_stats_collector").setLevel(logging.WARNING)
+
+    results = run(
+        parsed.games,
+        parsed.latency_ms / 1000,
+        write_mode=parsed.write_mode,
+        chunk_size=parsed.chunk_size,
+        max_workers=parsed.max_workers,
+    )
+    if parsed.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+
+    print(
+        f"{results['games']} games, {results['rows']} rows in "
+        f"{results['seconds']:.3f}s ({results['rows'] / results['seconds']:.0f} rows/s), "
+        f"{results['failed_rows']} failed"
+    )
+    print(
+        f"HTTP stage: {results['http_requests']} requests, "
+        f"{results['http_seconds']:.3f}s summed over workers"
+    )
+    print(f"Peak memory: {results['peak_memory_mb']:.1f} MB")
+    print(f"{'table':<36}{'rows':>10}{'write s':>10}{'rows/s':>12}")
+    for table_name, table_seconds in sorted(
+        results["table_seconds"].items(), key=lambda item: -item[1]
+    ):
+        table_rows = results["table_rows"][table_name]
+        print(
+            f"{table_name:<36}{table_rows:>10}{table_seconds:>10.3f}"
+            f"{table_rows / table_seconds if table_seconds else 0:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
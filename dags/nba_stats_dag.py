@@ -1,19 +1,78 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from airflow import DAG
+from airflow.exceptions import AirflowException
 from airflow.operators.python import PythonOperator
+from nba_stats_collector.artifacts import ArtifactStore
 from nba_stats_collector.etl import NBAStatsETL
 
 
-nba_stats_etl = NBAStatsETL(-1)
+# Nothing here touches the network or the database at parse time. The fetch
+# task saves the night's payloads to an ArtifactStore keyed by the run's date
+# and every load task rebuilds its clients from those files.
+def get_artifact_store(ds):
+    return ArtifactStore(date.fromisoformat(ds))
+
+
+def get_etl(artifact_store):
+    return NBAStatsETL(
+        game_date=artifact_store.game_date, games_stats=artifact_store.scoreboard()
+    )
+
+
+# Tasks raise instead of logging and moving on, so that Airflow retries and
+# alerts on a night with missing games or rows.
+def check_failed_rows(nba_stats_etl, description):
+    if nba_stats_etl.failed_rows:
+        raise AirflowException(
+            f"Failed to store some rows of {description}: "
+            f"{dict(nba_stats_etl.failed_rows)}"
+        )
+
 
 # Define the main function for each task
-def run_store_game_day_data(task_instance, *args, **kwargs):
-    keyword = task_instance.xcom_pull(key="keyword")
+def run_fetch_payloads(ds, **kwargs):
+    # One mapped boxscore and play-by-play task is created per returned game
+    artifact_store = get_artifact_store(ds)
+    nba_stats_etl = NBAStatsETL(game_date=artifact_store.game_date)
+    games = nba_stats_etl.fetch_artifacts(artifact_store)
+    missing_game_ids = set(nba_stats_etl.games_stats.get_games_list()) - {
+        game["game_id"] for game in games
+    }
+    if missing_game_ids:
+        raise AirflowException(
+            f"Failed to fetch the payloads of games {sorted(missing_game_ids)}"
+        )
+    return games
+
+
+def run_store_game_day_data(keyword, ds, **kwargs):
+    nba_stats_etl = get_etl(get_artifact_store(ds))
     nba_stats_etl.store_game_day_data(keyword)
+    check_failed_rows(nba_stats_etl, f"the {keyword} data of {ds}")
+
 
+def run_store_game_stats(game_id, ds, game_status_id=None, **kwargs):
+    artifact_store = get_artifact_store(ds)
+    nba_stats_etl = get_etl(artifact_store)
+    nba_stats_etl.store_game_stats(artifact_store.game_client("boxscore", game_id))
+    check_failed_rows(nba_stats_etl, f"the boxscore of game {game_id}")
 
-def run_store_single_game_data(*args, **kwargs):
-    nba_stats_etl.store_single_game_data()
+
+def run_store_playbyplay_data(game_id, ds, game_status_id=None, **kwargs):
+    artifact_store = get_artifact_store(ds)
+    nba_stats_etl = get_etl(artifact_store)
+    nba_stats_etl.store_playbyplay_actions(
+        artifact_store.game_client("playbyplay", game_id)
+    )
+    check_failed_rows(nba_stats_etl, f"the play-by-play of game {game_id}")
+
+
+def run_finish_games_data(task_instance, ds, **kwargs):
+    games = task_instance.xcom_pull(task_ids="fetch_payloads") or []
+    artifact_store = get_artifact_store(ds)
+    nba_stats_etl = get_etl(artifact_store)
+    nba_stats_etl.finish_games_data([game["game_id"] for game in games])
+    artifact_store.remove_expired()
 
 
 # Define the DAG
@@ -33,25 +92,47 @@ dag = DAG(
 )
 
 # Define the tasks
-tasks = [
-    PythonOperator(
+fetch_payloads_task = PythonOperator(
+    task_id="fetch_payloads",
+    python_callable=run_fetch_payloads,
+    dag=dag,
+)
+
+# Headers load first: the other game day tables and the per-game tables have a
+# foreign key to game_headers. The rest of the game day tables load in parallel.
+game_day_tasks = {
+    keyword: PythonOperator(
         task_id=f"store_{keyword}_data",
         python_callable=run_store_game_day_data,
-        op_args=[],
         op_kwargs={"keyword": keyword},
-        provide_context=True,
         dag=dag,
     )
-    for keyword in nba_stats_etl.game_day_data_config.keys()
-]
+    for keyword in NBAStatsETL.game_day_data_config.keys()
+}
+store_headers_task = game_day_tasks.pop("headers")
 
-store_single_game_data_task = PythonOperator(
+# Boxscores and play-by-play are mapped to one task instance per game
+store_game_stats_task = PythonOperator.partial(
     task_id="store_single_game_data",
-    python_callable=run_store_single_game_data,
+    python_callable=run_store_game_stats,
+    dag=dag,
+).expand(op_kwargs=fetch_payloads_task.output)
+
+store_playbyplay_data_task = PythonOperator.partial(
+    task_id="store_playbyplay_data",
+    python_callable=run_store_playbyplay_data,
+    dag=dag,
+).expand(op_kwargs=fetch_payloads_task.output)
+
+finish_games_data_task = PythonOperator(
+    task_id="finish_games_data",
+    python_callable=run_finish_games_data,
     dag=dag,
 )
 
 # Set task dependencies
-for i in range(len(tasks) - 1):
-    tasks[i] >> tasks[i + 1]
-tasks[-1] >> store_single_game_data_task
+fetch_payloads_task >> store_headers_task
+store_headers_task >> list(game_day_tasks.values())
+store_headers_task >> [store_game_stats_task, store_playbyplay_data_task]
+list(game_day_tasks.values()) >> finish_games_data_task
+[store_game_stats_task, store_playbyplay_data_task] >> finish_games_data_task
@@ -0,0 +1,81 @@
+import gzip
+import json
+import os
+import shutil
+from datetime import date, timedelta
+from nba_stats_collector.atomic import atomic_path
+from nba_stats_collector.config import (
+    NBA_API_ARTIFACT_DIR,
+    NBA_API_ARTIFACT_RETENTION_DAYS,
+)
+from nba_stats_collector.nba_api_client import NBAGames, NBAGameStats, NBAPlayByPlay
+
+
+class ArtifactStore:
+    """Raw NBA API payloads of one game date, stored as gzipped JSON.
+
+    The payloads are fetched once, see ``NBAStatsETL.fetch_artifacts``, and
+    each load task rebuilds its clients from the files instead of calling the
+    API again. Files live under ``<artifact_dir>/<game_date>/<kind>/<key>.json.gz``,
+    so ``artifact_dir`` must be an absolute path every worker can read.
+    """
+
+    kinds = {
+        "boxscore": NBAGameStats,
+        "playbyplay": NBAPlayByPlay,
+    }
+
+    def __init__(self, game_date, artifact_dir=NBA_API_ARTIFACT_DIR):
+        if not artifact_dir or not os.path.isabs(artifact_dir):
+            raise ValueError(
+                "NBA_API_ARTIFACT_DIR must be an absolute path shared by every "
+                f"worker, got {artifact_dir!r}"
+            )
+        self.game_date = game_date
+        self.artifact_dir = artifact_dir
+
+    def path(self, kind, key):
+        return os.path.join(
+            self.artifact_dir, self.game_date.isoformat(), kind, f"{key}.json.gz"
+        )
+
+    def save(self, kind, key, payload):
+        path = self.path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_path(path) as temp_path:
+            with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+                json.dump(payload, file)
+
+    def remove_expired(self, retention_days=NBA_API_ARTIFACT_RETENTION_DAYS):
+        """Delete the payloads of game dates more than ``retention_days`` before
+        the store's date. Returns the dates removed."""
+        cutoff = self.game_date - timedelta(days=retention_days)
+        removed = []
+        if not os.path.isdir(self.artifact_dir):
+            return removed
+
+        for entry in os.scandir(self.artifact_dir):
+            try:
+                entry_date = date.fromisoformat(entry.name)
+            except ValueError:
+                continue
+            if entry.is_dir() and entry_date < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed.append(entry_date)
+        return sorted(removed)
+
+    def load(self, kind, key):
+        with gzip.open(self.path(kind, key), "rt", encoding="utf-8") as file:
+            return json.load(file)
+
+    def save_client(self, kind, client):
+        self.save(kind, client.game_id, client.payload)
+
+    def scoreboard(self):
+        return NBAGames(
+            game_date=self.game_date,
+            payload=self.load("scoreboard", self.game_date.isoformat()),
+        )
+
+    def game_client(self, kind, game_id, **options):
+        return self.kinds[kind](game_id, payload=self.load(kind, game_id), **options)
@@ -0,0 +1,26 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temporary path in the directory of ``path`` and move it over
+    ``path`` once the block succeeds, so readers never see a partial file.
+
+    The temporary name is unique across threads and processes, and the file is
+    removed if the block fails.
+    """
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", suffix=".tmp"
+    )
+    os.close(descriptor)
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
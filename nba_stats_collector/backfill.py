@@ -0,0 +1,209 @@
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from sqlalchemy import select
+from nba_stats_collector.etl import NBAStatsETL
+from nba_stats_collector.models import BackfillCheckpoint
+from nba_stats_collector.nba_api_client import NBAGames, NBAGameStats, NBAPlayByPlay
+from nba_stats_collector.upsert import build_insert
+
+logger = logging.getLogger(__name__)
+
+
+class SeasonBackfill:
+    """Load every game day in a date range, resuming from recorded checkpoints.
+
+    Scoreboards for a batch of days are fetched in parallel, then the boxscore
+    and play-by-play fetches of the whole batch share one thread pool. Each
+    day and game stored without failed rows is recorded in
+    ``backfill_checkpoints`` so an interrupted run skips the work that
+    already landed.
+    """
+
+    game_day_stage = "game_day"
+    day_complete_stage = "day_complete"
+
+    def __init__(self, start_date, end_date, batch_days=7, **etl_options):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.batch_days = batch_days
+        self.etl = NBAStatsETL(**etl_options)
+        self.game_stages = {
+            "boxscore": (NBAGameStats, self.etl.store_game_stats),
+            "playbyplay": (NBAPlayByPlay, self.etl.store_playbyplay_actions),
+        }
+        self._checkpoint_statement = build_insert(
+            BackfillCheckpoint.__table__, self.etl.engine.dialect.name, "update"
+        )
+
+    @classmethod
+    def for_season(cls, season, **options):
+        """Backfill a season given as "2022-23", from October through June."""
+        start_year = int(season[:4])
+        end_date = min(date(start_year + 1, 6, 30), date.today() - timedelta(days=1))
+        return cls(date(start_year, 10, 1), end_date, **options)
+
+    def dates(self):
+        for offset in range((self.end_date - self.start_date).days + 1):
+            yield self.start_date + timedelta(days=offset)
+
+    def completed(self):
+        statement = select(
+            BackfillCheckpoint.game_date,
+            BackfillCheckpoint.game_id,
+            BackfillCheckpoint.stage,
+        ).where(BackfillCheckpoint.game_date.between(self.start_date, self.end_date))
+        with self.etl.engine.connect() as connection:
+            return {tuple(row) for row in connection.execute(statement)}
+
+    def mark_complete(self, game_date, game_id, stage):
+        with self.etl.engine.begin() as connection:
+            connection.execute(
+                self._checkpoint_statement,
+                {
+                    "game_date": game_date,
+                    "game_id": game_id,
+                    "stage": stage,
+                    "completed_at": datetime.utcnow(),
+                },
+            )
+
+    def fetch_scoreboards(self, game_dates):
+        """Return ``{game_date: NBAGames}``, leaving out the days whose
+        scoreboard could not be fetched so a later run picks them up."""
+
+        def fetch(game_date):
+            try:
+                return self.etl.fetch_client(NBAGames, game_date=game_date)
+            except Exception as e:
+                logger.error(
+                    f"Failed to fetch the scoreboard of {game_date}. Error: {e}"
+                )
+                self.etl.failed_fetches[NBAGames.__name__] += 1
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.etl.max_workers) as executor:
+            scoreboards = dict(zip(game_dates, executor.map(fetch, game_dates)))
+        return {
+            game_date: games_stats
+            for game_date, games_stats in scoreboards.items()
+            if games_stats is not None
+        }
+
+    def run(self):
+        completed = self.completed()
+        pending_dates = [
+            game_date
+            for game_date in self.dates()
+            if (game_date, "", self.day_complete_stage) not in completed
+        ]
+        logger.info(
+            f"Backfilling {len(pending_dates)} game days between {self.start_date} "
+            f"and {self.end_date}."
+        )
+        for start in range(0, len(pending_dates), self.batch_days):
+            self.run_batch(pending_dates[start : start + self.batch_days], completed)
+
+    def run_batch(self, game_dates, completed):
+        scoreboards = self.fetch_scoreboards(game_dates)
+
+        jobs = []
+        game_statuses = {}
+        remaining_jobs = {}
+        failed_dates = set()
+        for game_date, games_stats in scoreboards.items():
+            if (game_date, "", self.game_day_stage) not in completed:
+                self.etl.games_stats = games_stats
+                failed_rows = self.count_failed_rows()
+                for keyword in self.etl.game_day_data_config:
+                    self.etl.store_game_day_data(keyword)
+                if self.count_failed_rows() == failed_rows:
+                    self.mark_complete(game_date, "", self.game_day_stage)
+                else:
+                    logger.warning(f"Some game day rows of {game_date} failed.")
+                    failed_dates.add(game_date)
+
+            game_statuses.update(games_stats.get_game_statuses())
+            remaining_jobs[game_date] = 0
+            for game_id in games_stats.get_games_list():
+                for stage, (client_class, store_method) in self.game_stages.items():
+                    if (game_date, game_id, stage) in completed:
+                        continue
+                    jobs.append(
+                        (
+                            client_class,
+                            game_id,
+                            self._checkpointed(store_method, game_date, stage),
+                        )
+                    )
+                    remaining_jobs[game_date] += 1
+
+        for game_date, count in remaining_jobs.items():
+            if not count and game_date not in failed_dates:
+                self.mark_complete(game_date, "", self.day_complete_stage)
+
+        for client, store_method in self.etl.fetch_jobs(jobs, game_statuses):
+            game_date, stored = store_method(client)
+            if not stored:
+                failed_dates.add(game_date)
+            remaining_jobs[game_date] -= 1
+            if not remaining_jobs[game_date] and game_date not in failed_dates:
+                self.mark_complete(game_date, "", self.day_complete_stage)
+                logger.info(f"Backfilled {game_date}.")
+
+        self.etl.refresh_team_game_log()
+        self.etl.stamp_data_version()
+        self.etl.export_parquet()
+
+    def count_failed_rows(self):
+        return sum(self.etl.failed_rows.values())
+
+    def _checkpointed(self, store_method, game_date, stage):
+        """Wrap ``store_method`` to checkpoint the game once its rows landed.
+        The wrapper returns the game's date and whether it was checkpointed."""
+
+        def store(client):
+            failed_rows = self.count_failed_rows()
+            stored = store_method(client) is not False
+            if not stored or self.count_failed_rows() != failed_rows:
+                logger.warning(
+                    f"Some {stage} rows of game {client.game_id} failed, "
+                    "it will be loaded again on the next run."
+                )
+                return game_date, False
+
+            self.mark_complete(game_date, client.game_id, stage)
+            return game_date, True
+
+        return store
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Backfill NBA stats for a date range.")
+    parser.add_argument("--season", help='Season to backfill, e.g. "2022-23".')
+    parser.add_argument("--start-date", type=date.fromisoformat)
+    parser.add_argument("--end-date", type=date.fromisoformat)
+    parser.add_argument("--batch-days", type=int, default=7)
+    parser.add_argument("--max-workers", type=int)
+    parsed = parser.parse_args(args)
+    if not parsed.season and not (parsed.start_date and parsed.end_date):
+        parser.error("either --season or both --start-date and --end-date are required")
+    return parsed
+
+
+def main(args=None):
+    parsed = parse_args(args)
+    options = {"batch_days": parsed.batch_days}
+    if parsed.max_workers:
+        options["max_workers"] = parsed.max_workers
+
+    if parsed.season:
+        backfill = SeasonBackfill.for_season(parsed.season, **options)
+    else:
+        backfill = SeasonBackfill(parsed.start_date, parsed.end_date, **options)
+    backfill.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from nba_stats_collector.atomic import atomic_path
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of endpoint payloads.
+
+    Entries are keyed by a hash of the endpoint name and its parameters. Each
+    entry carries its own expiry (``None`` keeps it until evicted), and the
+    least recently used files are evicted once the cache grows past
+    ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._sizes = {
+            entry.path: entry.stat().st_size
+            for entry in os.scandir(self.cache_dir)
+            if entry.name.endswith(".json")
+        }
+
+    @staticmethod
+    def make_key(endpoint, params):
+        raw_key = json.dumps([endpoint, params], sort_keys=True, default=str)
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def _path(self, endpoint, params):
+        return os.path.join(self.cache_dir, f"{self.make_key(endpoint, params)}.json")
+
+    def get(self, endpoint, params):
+        path = self._path(endpoint, params)
+        try:
+            with open(path, "r") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if entry["expires_at"] is not None and entry["expires_at"] < time.time():
+            self._remove(path)
+            return None
+
+        # The file mtime doubles as the last access time for LRU eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["payload"]
+
+    def set(self, endpoint, params, payload, ttl=None):
+        """Store a payload; ``ttl`` is in seconds, ``None`` never expires and 0
+        skips caching."""
+        if ttl == 0:
+            return
+
+        path = self._path(endpoint, params)
+        expires_at = time.time() + ttl if ttl is not None else None
+        data = json.dumps({"expires_at": expires_at, "payload": payload})
+
+        with atomic_path(path) as temp_path:
+            with open(temp_path, "w") as file:
+                file.write(data)
+
+        with self._lock:
+            self._sizes[path] = len(data)
+        self._evict()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._sizes.pop(path, None)
+
+    def _evict(self):
+        with self._lock:
+            if sum(self._sizes.values()) <= self.max_bytes:
+                return
+            paths = list(self._sizes)
+
+        def last_access(path):
+            try:
+                return os.stat(path).st_mtime
+            except OSError:
+                return 0.0
+
+        total = sum(self._sizes.get(path, 0) for path in paths)
+        for path in sorted(paths, key=last_access):
+            if total <= self.max_bytes:
+                break
+            total -= self._sizes.get(path, 0)
+            self._remove(path)
@@ -2,11 +2,11 @@ from decouple import config
 
 # Database configuration
 DB_TYPE = config("DB_TYPE", default="sqlite")  # SQLite as default database
-DB_HOST = config("DB_HOST")
-DB_PORT = config("DB_PORT")
+DB_HOST = config("DB_HOST", default="")
+DB_PORT = config("DB_PORT", default="")
 DB_NAME = config("DB_NAME", default="nba_stats.db")  # SQLite database file name
-DB_USER = config("DB_USER")
-DB_PASSWORD = config("DB_PASSWORD")
+DB_USER = config("DB_USER", default="")
+DB_PASSWORD = config("DB_PASSWORD", default="")
 
 # Build the connection string
 if DB_TYPE == "sqlite":
@@ -14,5 +14,93 @@ if DB_TYPE == "sqlite":
 else:
     DATABASE_URL = f"{DB_TYPE}://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Connection pool settings; the size and overflow are ignored for SQLite
+DB_POOL_SIZE = config("DB_POOL_SIZE", default=5, cast=int)
+DB_MAX_OVERFLOW = config("DB_MAX_OVERFLOW", default=10, cast=int)
+DB_POOL_PRE_PING = config("DB_POOL_PRE_PING", default=True, cast=bool)
+# Seconds before a pooled connection is replaced, -1 to keep it forever
+DB_POOL_RECYCLE = config("DB_POOL_RECYCLE", default=1800, cast=int)
+# PostgreSQL statement_timeout in milliseconds, 0 to disable it
+DB_STATEMENT_TIMEOUT_MS = config("DB_STATEMENT_TIMEOUT_MS", default=0, cast=int)
+
+# ETL settings
+# "bulk", "orm" or "copy"; "copy" uses PostgreSQL COPY and falls back to
+# "bulk" on other databases
+ETL_WRITE_MODE = config("ETL_WRITE_MODE", default="bulk")
+ETL_CHUNK_SIZE = config("ETL_CHUNK_SIZE", default=500, cast=int)
+# "update", "ignore" or "error" when a row's primary key already exists
+ETL_ON_CONFLICT = config("ETL_ON_CONFLICT", default="update")
+ETL_MAX_WORKERS = config("ETL_MAX_WORKERS", default=4, cast=int)
+# "tables" keeps one table per play-by-play action type, "events" writes them
+# all to pbp_events
+ETL_PBP_STORAGE = config("ETL_PBP_STORAGE", default="tables")
+
+# NBA API settings
+NBA_API_REQUESTS_PER_SECOND = config(
+    "NBA_API_REQUESTS_PER_SECOND", default=2.0, cast=float
+)
+NBA_API_BURST = config("NBA_API_BURST", default=1, cast=int)
+# Transient failures are retried with jittered exponential backoff
+NBA_API_MAX_RETRIES = config("NBA_API_MAX_RETRIES", default=3, cast=int)
+NBA_API_RETRY_BASE_SECONDS = config(
+    "NBA_API_RETRY_BASE_SECONDS", default=1.0, cast=float
+)
+NBA_API_RETRY_MAX_SECONDS = config(
+    "NBA_API_RETRY_MAX_SECONDS", default=30.0, cast=float
+)
+# Requests pause for the cooldown once the error rate over the window is
+# reached; a window of 0 disables the circuit breaker
+NBA_API_BREAKER_WINDOW = config("NBA_API_BREAKER_WINDOW", default=20, cast=int)
+NBA_API_BREAKER_ERROR_RATE = config(
+    "NBA_API_BREAKER_ERROR_RATE", default=0.5, cast=float
+)
+NBA_API_BREAKER_COOLDOWN_SECONDS = config(
+    "NBA_API_BREAKER_COOLDOWN_SECONDS", default=60.0, cast=float
+)
+# "http" reuses pooled keep-alive connections, "nba_api" lets the nba_api
+# endpoint classes open one connection per request
+NBA_API_TRANSPORT = config("NBA_API_TRANSPORT", default="http")
+NBA_API_POOL_SIZE = config("NBA_API_POOL_SIZE", default=10, cast=int)
+NBA_API_TIMEOUT_SECONDS = config("NBA_API_TIMEOUT_SECONDS", default=30.0, cast=float)
+
+# NBA API response cache; leave NBA_API_CACHE_DIR empty to disable it
+NBA_API_CACHE_DIR = config("NBA_API_CACHE_DIR", default="")
+NBA_API_CACHE_MAX_MB = config("NBA_API_CACHE_MAX_MB", default=512, cast=int)
+NBA_API_CACHE_TTL_LIVE = config("NBA_API_CACHE_TTL_LIVE", default=15, cast=int)
+NBA_API_CACHE_TTL_SCHEDULED = config(
+    "NBA_API_CACHE_TTL_SCHEDULED", default=300, cast=int
+)
+
+# Raw payloads handed from the DAG's fetch task to its load tasks. The tasks
+# may run on different workers, so this must be an absolute path on storage
+# they all share; the DAG fails when it is unset or relative. Dates older than
+# the retention are removed once a run finishes.
+NBA_API_ARTIFACT_DIR = config("NBA_API_ARTIFACT_DIR", default="")
+NBA_API_ARTIFACT_RETENTION_DAYS = config(
+    "NBA_API_ARTIFACT_RETENTION_DAYS", default=7, cast=int
+)
+
+# Live game polling, in seconds
+LIVE_POLL_MIN_SECONDS = config("LIVE_POLL_MIN_SECONDS", default=3.0, cast=float)
+LIVE_POLL_MAX_SECONDS = config("LIVE_POLL_MAX_SECONDS", default=30.0, cast=float)
+LIVE_SCOREBOARD_POLL_SECONDS = config(
+    "LIVE_SCOREBOARD_POLL_SECONDS", default=60.0, cast=float
+)
+# A game stops being polled after this many failed polls in a row
+LIVE_POLL_MAX_FAILURES = config("LIVE_POLL_MAX_FAILURES", default=10, cast=int)
+
+# Webapp query cache; leave QUERY_CACHE_DIR empty to keep it in memory only
+QUERY_CACHE_MAX_ENTRIES = config("QUERY_CACHE_MAX_ENTRIES", default=256, cast=int)
+QUERY_CACHE_DIR = config("QUERY_CACHE_DIR", default="")
+# How often to re-read the ETL data version, in seconds
+QUERY_CACHE_VERSION_CHECK_SECONDS = config(
+    "QUERY_CACHE_VERSION_CHECK_SECONDS", default=5.0, cast=float
+)
+FIGURE_CACHE_MAX_ENTRIES = config("FIGURE_CACHE_MAX_ENTRIES", default=128, cast=int)
+
+# Parquet archive written after each ETL run; leave PARQUET_EXPORT_DIR empty
+# to disable it. Requires pyarrow.
+PARQUET_EXPORT_DIR = config("PARQUET_EXPORT_DIR", default="")
+
 # Other settings
 LOG_LEVEL = config("LOG_LEVEL", default="INFO")
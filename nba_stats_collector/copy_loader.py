@@ -0,0 +1,86 @@
+import io
+from sqlalchemy import Column, MetaData, Table, select, true
+from nba_stats_collector.upsert import build_insert
+
+
+def format_csv_value(value):
+    # COPY's CSV format reads an unquoted empty field as NULL, so strings are
+    # always quoted to keep "" distinct from None.
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+def rows_to_csv(rows, columns):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(format_csv_value(row.get(column)) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def dedupe_rows(rows, table):
+    # A merge can only touch each key once per statement; the last row wins
+    # like it would with row by row upserts.
+    key_columns = [column.name for column in table.primary_key.columns]
+    deduped = {}
+    for row in rows:
+        deduped[tuple(row.get(column) for column in key_columns)] = row
+    return list(deduped.values())
+
+
+def staging_table(table):
+    return Table(
+        f"{table.name}_staging",
+        MetaData(),
+        *[Column(column.name, column.type) for column in table.columns],
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+def merge_statement(table, staging, on_conflict="update", dialect_name="postgresql"):
+    # SQLite needs a WHERE clause to parse ON CONFLICT after INSERT ... SELECT
+    return build_insert(table, dialect_name, on_conflict).from_select(
+        [column.name for column in table.columns],
+        select(*staging.columns).where(true()),
+    )
+
+
+def copy_rows(connection, table, rows, on_conflict="update"):
+    """Load rows with PostgreSQL ``COPY ... FROM STDIN``.
+
+    Rows are written to an in-memory CSV buffer. With ``on_conflict`` "error"
+    they are copied straight into the table; otherwise they go through a
+    temporary staging table that is merged with an ``ON CONFLICT`` insert.
+    Must run inside a transaction on a psycopg2 connection. Returns the number
+    of rows copied, or inserted and updated by the merge.
+    """
+    columns = [column.name for column in table.columns]
+    if on_conflict == "error":
+        target = table
+    else:
+        target = staging_table(table)
+        target.create(connection)
+        rows = dedupe_rows(rows, table)
+
+    quote = connection.dialect.identifier_preparer.quote
+    copy_sql = (
+        f"COPY {quote(target.name)} ({', '.join(quote(column) for column in columns)}) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(copy_sql, rows_to_csv(rows, columns))
+    finally:
+        cursor.close()
+
+    if on_conflict == "error":
+        return len(rows)
+    result = connection.execute(
+        merge_statement(table, target, on_conflict, connection.dialect.name)
+    )
+    return result.rowcount
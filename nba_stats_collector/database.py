@@ -0,0 +1,65 @@
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from nba_stats_collector.config import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_STATEMENT_TIMEOUT_MS,
+)
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets the dashboard read while the ETL writes
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def engine_options(url):
+    """Return the create_engine keyword arguments configured for a URL."""
+    url = make_url(url)
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    if url.get_backend_name() == "sqlite":
+        return options
+
+    options["pool_size"] = DB_POOL_SIZE
+    options["max_overflow"] = DB_MAX_OVERFLOW
+    if DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+
+def create_configured_engine(url=DATABASE_URL):
+    engine = create_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def get_engine(url=DATABASE_URL):
+    """Return the process-wide engine for a URL, creating it on first use.
+
+    In-memory SQLite databases live and die with their engine, so each call
+    gets a new one.
+    """
+    parsed_url = make_url(url)
+    if parsed_url.get_backend_name() == "sqlite" and parsed_url.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        return create_configured_engine(url)
+
+    with _engines_lock:
+        if url not in _engines:
+            _engines[url] = create_configured_engine(url)
+        return _engines[url]
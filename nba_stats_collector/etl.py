@@ -1,4 +1,9 @@
 import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from datetime import datetime
 from sqlalchemy.orm import sessionmaker
 from nba_stats_collector.models import (
     Team,
@@ -25,22 +30,123 @@ from nba_stats_collector.models import (
     Block,
     Violation,
     Game,
-    Base,
+    DataVersion,
+    PlayByPlayEvent,
+    PlayByPlayWatermark,
+    Shot,
+)
+from nba_stats_collector.config import (
+    DATABASE_URL,
+    ETL_CHUNK_SIZE,
+    ETL_MAX_WORKERS,
+    ETL_ON_CONFLICT,
+    ETL_PBP_STORAGE,
+    ETL_WRITE_MODE,
+    NBA_API_BREAKER_COOLDOWN_SECONDS,
+    NBA_API_BREAKER_ERROR_RATE,
+    NBA_API_BREAKER_WINDOW,
+    NBA_API_BURST,
+    NBA_API_MAX_RETRIES,
+    NBA_API_REQUESTS_PER_SECOND,
+    NBA_API_RETRY_BASE_SECONDS,
+    NBA_API_RETRY_MAX_SECONDS,
+    PARQUET_EXPORT_DIR,
 )
-from nba_stats_collector.config import DATABASE_URL
 from nba_stats_collector.nba_api_client import (
     NBAGames,
     NBAGameStats,
     NBAPlayByPlay,
     get_team_data,
 )
-from sqlalchemy import create_engine
+from nba_stats_collector import materialized
+from nba_stats_collector.copy_loader import copy_rows
+from nba_stats_collector.database import get_engine
+from nba_stats_collector.parquet_export import ParquetExporter
+from nba_stats_collector.schema import create_schema
+from nba_stats_collector.throttle import (
+    CircuitBreaker,
+    RetryPolicy,
+    is_retryable,
+    shared_rate_limiter,
+)
+from nba_stats_collector.upsert import build_insert
+from sqlalchemy import DateTime, String, select, update
+from sqlalchemy.exc import SQLAlchemyError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _to_datetime(value):
+    if not isinstance(value, str):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # Standings dates come as MM/DD/YYYY
+        return datetime.strptime(value, "%m/%d/%Y")
+
+
+def _to_string(value):
+    if isinstance(value, list):
+        return ",".join(str(item) for item in value)
+    return value
+
+
+def _client_name(client_class):
+    # Jobs may pass a functools.partial of a client class
+    return getattr(client_class, "func", client_class).__name__
+
+
+def _column_converters(table):
+    converters = {}
+    for column in table.columns:
+        if isinstance(column.type, DateTime):
+            converters[column.name] = _to_datetime
+        elif isinstance(column.type, String):
+            converters[column.name] = _to_string
+        else:
+            converters[column.name] = None
+    return converters
+
+
+def prepare_rows(data, table):
+    """Filter API rows down to the table columns, coercing timestamps and lists.
+
+    ``data`` is either a list of dicts or a ``(headers, rows)`` pair as returned
+    by ``process_endpoint_data(index, orient="tuples")``.
+    """
+    converters = _column_converters(table)
+
+    if isinstance(data, tuple):
+        headers, data_rows = data
+        positions = {header: position for position, header in enumerate(headers)}
+        columns = [
+            (name, converter, positions.get(name))
+            for name, converter in converters.items()
+        ]
+        rows = []
+        for data_row in data_rows:
+            row = {}
+            for name, converter, position in columns:
+                value = data_row[position] if position is not None else None
+                row[name] = converter(value) if converter else value
+            rows.append(row)
+        return rows
+
+    rows = []
+    for data_dict in data:
+        row = {}
+        for name, converter in converters.items():
+            value = data_dict.get(name)
+            row[name] = converter(value) if converter else value
+        rows.append(row)
+    return rows
+
+
 class NBAStatsETL:
     playbyplay_data_config = {
         "period": (Period, "get_period"),
@@ -73,68 +179,462 @@ class NBAStatsETL:
         "west_standing": (WestStandingByDate, "get_west_standing"),
     }
 
-    def __init__(self, day_offset=-1):
+    def __init__(
+        self,
+        day_offset=-1,
+        game_date=None,
+        games_stats=None,
+        write_mode=ETL_WRITE_MODE,
+        chunk_size=ETL_CHUNK_SIZE,
+        on_conflict=ETL_ON_CONFLICT,
+        max_workers=ETL_MAX_WORKERS,
+        requests_per_second=NBA_API_REQUESTS_PER_SECOND,
+        pbp_storage=ETL_PBP_STORAGE,
+        parquet_export_dir=PARQUET_EXPORT_DIR,
+        transport=None,
+        max_retries=NBA_API_MAX_RETRIES,
+        retry_base_seconds=NBA_API_RETRY_BASE_SECONDS,
+        circuit_breaker=None,
+    ):
         self.day_offset = day_offset
-        self.games_stats = NBAGames(day_offset=self.day_offset)
-        self.engine = create_engine(DATABASE_URL)
-        Base.metadata.create_all(self.engine)
+        self.game_date = game_date
+        self.write_mode = write_mode
+        self.chunk_size = chunk_size
+        self.on_conflict = on_conflict
+        self.max_workers = max_workers
+        self.pbp_storage = pbp_storage
+        self.parquet_export_dir = parquet_export_dir
+        self.transport = transport
+        self.rate_limiter = shared_rate_limiter(requests_per_second, NBA_API_BURST)
+        self.retry_policy = RetryPolicy(
+            max_retries, retry_base_seconds, NBA_API_RETRY_MAX_SECONDS
+        )
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            NBA_API_BREAKER_WINDOW,
+            NBA_API_BREAKER_ERROR_RATE,
+            NBA_API_BREAKER_COOLDOWN_SECONDS,
+        )
+        self.failed_rows = Counter()
+        self.failed_fetches = Counter()
+        self._insert_statements = {}
+        self._stale_team_ids = set()
+        self._stale_game_ids = set()
+        self._games_stats = games_stats
+        self.engine = get_engine(DATABASE_URL)
+        create_schema(self.engine, self.pbp_storage)
         self.Session = sessionmaker(bind=self.engine)
 
-    def commit_data(self, data_list, table_model):
+    @property
+    def games_stats(self):
+        # The scoreboard is fetched on first use so constructing the ETL does
+        # no network I/O.
+        if self._games_stats is None:
+            self._games_stats = self.fetch_client(
+                NBAGames, day_offset=self.day_offset, game_date=self.game_date
+            )
+        return self._games_stats
+
+    @games_stats.setter
+    def games_stats(self, games_stats):
+        self._games_stats = games_stats
+
+    def fetch_client(self, client_class, *args, **kwargs):
+        """Build an NBA API client through the ETL's transport.
+
+        Every attempt waits for the circuit breaker and the shared rate
+        limiter. Transient failures are retried with jittered exponential
+        backoff, and the last one is raised.
+        """
+        for attempt in range(self.retry_policy.max_retries + 1):
+            self.circuit_breaker.wait()
+            self.rate_limiter.wait()
+            try:
+                client = client_class(*args, transport=self.transport, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                self.circuit_breaker.record(False)
+                if attempt == self.retry_policy.max_retries:
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                logger.warning(
+                    f"Retrying {_client_name(client_class)} in {delay:.1f}s. Error: {e}"
+                )
+                time.sleep(delay)
+            else:
+                self.circuit_breaker.record(True)
+                return client
+
+    def commit_data(self, data_list, table_model, on_conflict=None):
+        """Write the rows and return how many landed. ``on_conflict`` overrides
+        the ETL's setting; the ORM mode cannot upsert, so an override always
+        goes through the bulk inserts."""
+        if self.write_mode == "orm" and on_conflict is None:
+            return self.orm_commit_data(data_list, table_model)
+        if self.write_mode == "copy" and self.engine.dialect.name == "postgresql":
+            return self.copy_commit_data(data_list, table_model, on_conflict)
+        return self.bulk_commit_data(data_list, table_model, on_conflict)
+
+    def copy_commit_data(self, data_list, table_model, on_conflict=None):
+        on_conflict = on_conflict or self.on_conflict
+        table = table_model.__table__
+        rows = prepare_rows(data_list, table)
+        if not rows:
+            return 0
+
+        # COPY is all or nothing, so a failing batch is retried through the
+        # chunked inserts to isolate the bad rows.
+        try:
+            with self.engine.begin() as connection:
+                counter = copy_rows(connection, table, rows, on_conflict)
+        except (SQLAlchemyError, self.engine.dialect.loaded_dbapi.Error) as e:
+            logger.warning(
+                f"COPY into {table.name} failed, falling back to inserts. Error: {e}"
+            )
+            counter = 0
+            for start in range(0, len(rows), self.chunk_size):
+                counter += self._insert_chunk(
+                    table, rows[start : start + self.chunk_size], on_conflict
+                )
+
+        logger.info(
+            f"Successfully commited {counter} data points to {table.name} table."
+        )
+        return counter
+
+    def bulk_commit_data(self, data_list, table_model, on_conflict=None):
+        table = table_model.__table__
+        rows = prepare_rows(data_list, table)
+        counter = 0
+        for start in range(0, len(rows), self.chunk_size):
+            counter += self._insert_chunk(
+                table, rows[start : start + self.chunk_size], on_conflict
+            )
+
+        logger.info(
+            f"Successfully commited {counter} data points to {table.name} table."
+        )
+        return counter
+
+    def insert_statement(self, table, on_conflict=None):
+        on_conflict = on_conflict or self.on_conflict
+        key = (table.name, on_conflict)
+        if key not in self._insert_statements:
+            self._insert_statements[key] = build_insert(
+                table, self.engine.dialect.name, on_conflict
+            )
+        return self._insert_statements[key]
+
+    def _insert_chunk(self, table, rows, on_conflict=None):
+        # One transaction per chunk; a failing chunk is bisected until the bad
+        # rows are isolated so the rest of the batch still lands.
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(self.insert_statement(table, on_conflict), rows)
+            return len(rows)
+
+        except SQLAlchemyError as e:
+            if len(rows) == 1:
+                self.failed_rows[table.name] += 1
+                logger.error(
+                    f"Failed to commit data to {table.name} table. Data: {rows[0]}. Error: {e}"
+                )
+                return 0
+
+            middle = len(rows) // 2
+            return self._insert_chunk(
+                table, rows[:middle], on_conflict
+            ) + self._insert_chunk(table, rows[middle:], on_conflict)
+
+    def orm_commit_data(self, data_list, table_model):
         session = self.Session()
-        team_columns = [column.name for column in table_model.__table__.columns]
         counter = 0
-        for data in data_list:
-            filtered_data = {
-                key: value for key, value in data.items() if key in team_columns
-            }
-            team = table_model(**filtered_data)
+        for data in prepare_rows(data_list, table_model.__table__):
+            team = table_model(**data)
             try:
                 session.add(team)
                 session.commit()
                 counter += 1
 
             except Exception as e:
+                session.rollback()
+                self.failed_rows[table_model.__tablename__] += 1
                 logger.error(
                     f"Failed to commit data to {table_model.__tablename__} table. Data: {data}. Error: {e}"
                 )
                 continue
 
+        session.close()
         logger.info(
             f"Successfully commited {counter} data points to {table_model.__tablename__} table."
         )
+        return counter
+
+    def stamp_data_version(self):
+        """Bump the data version so readers drop results cached before this load."""
+        now = datetime.utcnow()
+        with self.engine.begin() as connection:
+            result = connection.execute(
+                update(DataVersion.__table__)
+                .where(DataVersion.id == 1)
+                .values(version=DataVersion.version + 1, updated_at=now)
+            )
+            if not result.rowcount:
+                connection.execute(
+                    build_insert(
+                        DataVersion.__table__, self.engine.dialect.name, "ignore"
+                    ),
+                    {"id": 1, "version": 1, "updated_at": now},
+                )
 
     def store_team_data(self):
         table_model = Team
         data_list = get_team_data()
         self.commit_data(data_list, table_model)
+        self.stamp_data_version()
 
     def store_game_day_data(self, keyword):
         table_model, data_method_name = self.game_day_data_config[keyword]
         data_method = getattr(self.games_stats, data_method_name)
-        data_list = data_method()
+        data_list = data_method(orient="tuples")
         self.commit_data(data_list, table_model)
+        self._stale_game_ids.update(self.games_stats.get_games_list())
+        self.stamp_data_version()
 
-    def store_single_game_data(self):
-        for game_id in self.games_stats.get_games_list():
-            ngs = NBAGameStats(game_id)
+    def fetch_games(self, clients, game_ids=None):
+        """Fetch every game with each client class on a bounded thread pool.
+
+        ``clients`` pairs a client class with the method that stores it. Pairs of
+        ``(client, store_method)`` are yielded in completion order so the caller
+        stays the only thread writing to the database.
+        """
+        if game_ids is None:
+            game_ids = self.games_stats.get_games_list()
+        jobs = [
+            (client_class, game_id, store_method)
+            for game_id in game_ids
+            for client_class, store_method in clients
+        ]
+        return self.fetch_jobs(jobs, self.games_stats.get_game_statuses())
+
+    def fetch_jobs(self, jobs, game_statuses=None):
+        """Run ``(client_class, game_id, store_method)`` jobs like ``fetch_games``.
+
+        A job that still fails after its retries is logged, counted in
+        ``failed_fetches`` and skipped, so one game cannot abort the others.
+        """
+        game_statuses = game_statuses or {}
+
+        def fetch(client_class, game_id):
+            return self.fetch_client(
+                client_class, game_id, game_status_id=game_statuses.get(game_id)
+            )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(fetch, client_class, game_id): (
+                    client_class,
+                    game_id,
+                    store_method,
+                )
+                for client_class, game_id, store_method in jobs
+            }
+            for future in as_completed(futures):
+                client_class, game_id, store_method = futures[future]
+                try:
+                    client = future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Failed to fetch {_client_name(client_class)} for game {game_id}. Error: {e}"
+                    )
+                    self.failed_fetches[_client_name(client_class)] += 1
+                    continue
+                yield client, store_method
+
+    def fetch_artifacts(self, store):
+        """Fetch the scoreboard, boxscores and play-by-play of the store's game
+        date once and save the raw payloads to the ArtifactStore.
+
+        Returns the games as ``{"game_id": ..., "game_status_id": ...}`` dicts,
+        leaving out the games with a payload that could not be fetched.
+        """
+        store.save("scoreboard", store.game_date.isoformat(), self.games_stats.payload)
+        game_statuses = self.games_stats.get_game_statuses()
+        jobs = [
+            (client_class, game_id, partial(store.save_client, kind))
+            for game_id in self.games_stats.get_games_list()
+            for kind, client_class in store.kinds.items()
+        ]
+        saved = Counter()
+        for client, save in self.fetch_jobs(jobs, game_statuses):
+            save(client)
+            saved[client.game_id] += 1
+        return [
+            {"game_id": game_id, "game_status_id": game_status_id}
+            for game_id, game_status_id in game_statuses.items()
+            if saved[game_id] == len(store.kinds)
+        ]
+
+    def store_game_stats(self, ngs):
+        for _, (
+            table_model,
+            data_method_name,
+        ) in self.single_game_data_config.items():
+            data_method = getattr(ngs, data_method_name)
+            data_list = data_method(orient="tuples")
+            self.commit_data(data_list, table_model)
+
+        self._stale_team_ids.update(ngs.get_team_stats(orient="columns")["team_id"])
+        self._stale_game_ids.add(ngs.game_id)
+
+    def store_playbyplay_actions(self, pbp, on_conflict=None):
+        """Store a game's play-by-play actions and shots. Returns whether every
+        row was written."""
+        batches = []
+        if self.pbp_storage == "events":
+            batches.append((pbp.game_actions, PlayByPlayEvent))
+        else:
+            for action_type, data_list in pbp.iter_actions():
+                if action_type not in self.playbyplay_data_config:
+                    logger.debug(
+                        f"Skipping unmapped play-by-play action type {action_type}."
+                    )
+                    continue
+
+                table_model, _ = self.playbyplay_data_config[action_type]
+                batches.append((data_list, table_model))
+
+        shots = materialized.shot_rows(pbp.get_2pt() + pbp.get_3pt())
+        if shots:
+            batches.append((shots, Shot))
 
-            for _, (
-                table_model,
-                data_method_name,
-            ) in self.single_game_data_config.items():
-                data_method = getattr(ngs, data_method_name)
-                data_list = data_method()
-                self.commit_data(data_list, table_model)
+        # Rows that fail are counted in failed_rows; this runs on the writer
+        # thread only, so the count is not shared with other games meanwhile.
+        failed_rows = sum(self.failed_rows.values())
+        for data_list, table_model in batches:
+            self.commit_data(data_list, table_model, on_conflict=on_conflict)
+        self._stale_game_ids.add(pbp.game_id)
+        return sum(self.failed_rows.values()) == failed_rows
+
+    def store_games_data(self, clients=None, game_ids=None):
+        if clients is None:
+            clients = [
+                (NBAGameStats, self.store_game_stats),
+                (NBAPlayByPlay, self.store_playbyplay_actions),
+            ]
+        for client, store_method in self.fetch_games(clients, game_ids):
+            store_method(client)
+        self.refresh_team_game_log()
+        self.stamp_data_version()
+        self.export_parquet()
+
+    def finish_games_data(self, game_ids):
+        """Refresh the derived tables for games stored by other processes, such
+        as the per-game tasks of the Airflow DAG."""
+        statement = select(GameHeaders.home_team_id, GameHeaders.visitor_team_id).where(
+            GameHeaders.game_id.in_(list(game_ids))
+        )
+        with self.engine.connect() as connection:
+            team_ids = {
+                team_id for row in connection.execute(statement) for team_id in row
+            }
+        self.refresh_team_game_log(team_ids)
+        self.stamp_data_version()
+        self.export_parquet(set(game_ids))
+
+    def store_single_game_data(self):
+        self.store_games_data([(NBAGameStats, self.store_game_stats)])
 
     def store_playbyplay_data(self):
-        for game_id in self.games_stats.get_games_list():
-            pbp = NBAPlayByPlay(game_id)
-
-            for _, (
-                table_model,
-                data_method_name,
-            ) in self.playbyplay_data_config.items():
-                data_method = getattr(pbp, data_method_name)
-                data_list = data_method()
-                self.commit_data(data_list, table_model)
+        self.store_games_data([(NBAPlayByPlay, self.store_playbyplay_actions)])
+
+    def refresh_team_game_log(self, team_ids=None):
+        """Refresh team_game_log for the given teams, by default the teams whose
+        boxscores were stored since the last refresh."""
+        if team_ids is None:
+            team_ids, self._stale_team_ids = self._stale_team_ids, set()
+        if not team_ids:
+            return 0
+
+        with self.engine.begin() as connection:
+            counter = materialized.refresh_team_game_log(connection, team_ids)
+        logger.info(
+            f"Refreshed {counter} team_game_log rows for {len(team_ids)} teams."
+        )
+        return counter
+
+    def get_playbyplay_watermarks(self, game_ids):
+        statement = select(
+            PlayByPlayWatermark.game_id,
+            PlayByPlayWatermark.action_number,
+            PlayByPlayWatermark.edited,
+        ).where(PlayByPlayWatermark.game_id.in_(game_ids))
+        with self.engine.connect() as connection:
+            return {
+                game_id: (action_number, edited)
+                for game_id, action_number, edited in connection.execute(statement)
+            }
+
+    def export_parquet(self, game_ids=None):
+        """Rewrite the Parquet partitions of the given games, by default the
+        games stored since the last export. Does nothing unless an export
+        directory is configured."""
+        if not self.parquet_export_dir:
+            return 0
+        if game_ids is None:
+            game_ids, self._stale_game_ids = self._stale_game_ids, set()
+        if not game_ids:
+            return 0
+
+        exporter = ParquetExporter(self.engine, self.parquet_export_dir)
+        return exporter.export(exporter.game_dates_for(game_ids))
+
+    def store_playbyplay_increment(self, pbp):
+        """Store new and edited actions, then move the game's watermark.
+
+        Returns False, keeping the watermark, when some rows failed so they are
+        fetched again on the next run.
+        """
+        # Edited actions are rewritten whatever the ETL's conflict setting
+        if not self.store_playbyplay_actions(pbp, on_conflict="update"):
+            logger.warning(
+                f"Some play-by-play rows of game {pbp.game_id} failed, keeping its watermark."
+            )
+            return False
+
+        watermark = pbp.get_watermark()
+        if pbp.watermark == (watermark["action_number"], watermark["edited"]):
+            return True
+
+        watermark["updated_at"] = datetime.utcnow()
+        with self.engine.begin() as connection:
+            connection.execute(
+                build_insert(
+                    PlayByPlayWatermark.__table__, self.engine.dialect.name, "update"
+                ),
+                watermark,
+            )
+        return True
+
+    def store_playbyplay_incremental(self, game_ids=None):
+        """Store only the play-by-play actions added or edited since the last run.
+
+        Each game's highest stored ``actionNumber`` and latest ``edited`` stamp
+        are kept in ``playbyplay_watermarks``; edited actions are rewritten.
+        """
+        if game_ids is None:
+            game_ids = self.games_stats.get_games_list()
+        watermarks = self.get_playbyplay_watermarks(game_ids)
+        jobs = [
+            (
+                partial(NBAPlayByPlay, watermark=watermarks.get(game_id)),
+                game_id,
+                self.store_playbyplay_increment,
+            )
+            for game_id in game_ids
+        ]
+        for client, store_method in self.fetch_jobs(
+            jobs, self.games_stats.get_game_statuses()
+        ):
+            store_method(client)
+        self.stamp_data_version()
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from nba_stats_collector.config import (
+    LIVE_POLL_MAX_FAILURES,
+    LIVE_POLL_MAX_SECONDS,
+    LIVE_POLL_MIN_SECONDS,
+    LIVE_SCOREBOARD_POLL_SECONDS,
+)
+from nba_stats_collector.etl import NBAStatsETL
+from nba_stats_collector.nba_api_client import (
+    GAME_STATUS_FINAL,
+    GAME_STATUS_LIVE,
+    GAME_STATUS_SCHEDULED,
+    NBAGames,
+    NBAPlayByPlay,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LiveGamePoller:
+    """Follow today's live games and push their new play-by-play into the DB.
+
+    The scoreboard is re-read every ``scoreboard_interval`` seconds and each
+    game whose status is live gets its own polling task. A game's interval
+    resets to ``min_interval`` whenever a poll brings new actions and doubles up
+    to ``max_interval`` while it is quiet. Polling stops once the play-by-play
+    or the scoreboard shows the game is final, or after ``max_failures`` polls
+    in a row failed. All DB writes go through a single writer thread.
+    """
+
+    def __init__(
+        self,
+        etl=None,
+        min_interval=LIVE_POLL_MIN_SECONDS,
+        max_interval=LIVE_POLL_MAX_SECONDS,
+        scoreboard_interval=LIVE_SCOREBOARD_POLL_SECONDS,
+        max_failures=LIVE_POLL_MAX_FAILURES,
+    ):
+        self.etl = etl or NBAStatsETL(day_offset=0)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.scoreboard_interval = scoreboard_interval
+        self.max_failures = max_failures
+        self.game_statuses = {}
+        self.polling = {}
+        self.finished = set()
+        self.failed = set()
+        self._writer = ThreadPoolExecutor(max_workers=1)
+
+    async def _write(self, method, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, method, *args)
+
+    def get_game_statuses(self):
+        self.etl.games_stats = self.etl.fetch_client(NBAGames, day_offset=0)
+        return self.etl.games_stats.get_game_statuses()
+
+    def fetch_playbyplay(self, game_id, watermark):
+        # Polls run more often than the live cache TTL, so skip the cache
+        return self.etl.fetch_client(
+            NBAPlayByPlay, game_id, GAME_STATUS_LIVE, watermark=watermark, ttl=0
+        )
+
+    async def run(self):
+        try:
+            while True:
+                try:
+                    game_statuses = await asyncio.to_thread(self.get_game_statuses)
+                except Exception as e:
+                    logger.error(f"Failed to refresh the scoreboard. Error: {e}")
+                    await asyncio.sleep(self.scoreboard_interval)
+                    continue
+
+                self.game_statuses = game_statuses
+                for game_id, game_status_id in game_statuses.items():
+                    if (
+                        game_status_id == GAME_STATUS_LIVE
+                        and game_id not in self.polling
+                        and game_id not in self.finished
+                    ):
+                        logger.info(f"Started polling game {game_id}.")
+                        self.polling[game_id] = asyncio.create_task(
+                            self.poll_game(game_id)
+                        )
+
+                pending_statuses = {
+                    game_status_id
+                    for game_id, game_status_id in game_statuses.items()
+                    if game_id not in self.finished | self.failed
+                }
+                if not pending_statuses & {GAME_STATUS_LIVE, GAME_STATUS_SCHEDULED}:
+                    break
+                await asyncio.sleep(self.scoreboard_interval)
+
+            await asyncio.gather(*self.polling.values())
+        finally:
+            self._writer.shutdown(wait=True)
+
+    async def read_watermark(self, game_id):
+        watermarks = await self._write(self.etl.get_playbyplay_watermarks, [game_id])
+        return watermarks.get(game_id)
+
+    async def poll_game(self, game_id):
+        watermark = await self.read_watermark(game_id)
+        interval = self.min_interval
+        failures = 0
+
+        while True:
+            try:
+                pbp = await asyncio.to_thread(self.fetch_playbyplay, game_id, watermark)
+                stored = await self._write(self.etl.store_playbyplay_increment, pbp)
+            except Exception as e:
+                logger.error(f"Failed to poll game {game_id}. Error: {e}")
+                stored = False
+            else:
+                if not stored:
+                    # The stored watermark did not move, so fetch from it again
+                    watermark = await self.read_watermark(game_id)
+
+            if not stored:
+                failures += 1
+                if failures >= self.max_failures:
+                    self.failed.add(game_id)
+                    logger.error(
+                        f"Stopped polling game {game_id} after {failures} failed polls."
+                    )
+                    return
+                interval = self.max_interval
+            else:
+                failures = 0
+                if (
+                    pbp.is_final()
+                    or self.game_statuses.get(game_id) == GAME_STATUS_FINAL
+                ):
+                    self.finished.add(game_id)
+                    logger.info(f"Game {game_id} is final, stopped polling.")
+                    return
+
+                new_watermark = pbp.get_watermark()
+                watermark = (new_watermark["action_number"], new_watermark["edited"])
+                if pbp.game_actions:
+                    interval = self.min_interval
+                else:
+                    interval = min(interval * 2, self.max_interval)
+
+            await asyncio.sleep(interval)
+
+
+def main():
+    asyncio.run(LiveGamePoller().run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+from sqlalchemy import (
+    bindparam,
+    delete,
+    insert,
+    literal,
+    select,
+    text,
+    union,
+    union_all,
+)
+from nba_stats_collector.config import DATABASE_URL
+from nba_stats_collector.database import get_engine
+from nba_stats_collector.models import (
+    GameHeaders,
+    Shot,
+    TeamGameLog,
+    ThreePoint,
+    TwoPoint,
+)
+
+team_game_log_columns = [column.name for column in TeamGameLog.__table__.columns]
+
+team_game_log_query = text("""
+    with all_teams_in_games as
+    (
+        select game_date_est,
+            game_id,
+            home_team_id as team_id,
+            'home' as home_or_away
+        from game_headers
+        where home_team_id in :team_ids
+        union
+        select game_date_est,
+            game_id,
+            visitor_team_id as team_id,
+            'away' as home_or_away
+        from game_headers
+        where visitor_team_id in :team_ids
+    )
+    select all_teams_in_games.team_id,
+        all_teams_in_games.game_id,
+        all_teams_in_games.game_date_est,
+        all_teams_in_games.home_or_away,
+        row_number() over(partition by all_teams_in_games.team_id order by all_teams_in_games.game_date_est) as game_number,
+        sum(case when all_teams_in_games.home_or_away = 'home' then 1 else 0 end) over(partition by all_teams_in_games.team_id order by all_teams_in_games.game_date_est rows between unbounded preceding and current row) as home_games_count,
+        sum(case when all_teams_in_games.home_or_away = 'away' then 1 else 0 end) over(partition by all_teams_in_games.team_id order by all_teams_in_games.game_date_est rows between unbounded preceding and current row) as away_games_count,
+        gls.team_abbreviation as team_name,
+        tsbg.fgm,
+        tsbg.fga,
+        tsbg.fg_pct,
+        tsbg.fg3m,
+        tsbg.fg3a,
+        tsbg.fg3_pct,
+        tsbg.ftm,
+        tsbg.fta,
+        tsbg.ft_pct,
+        tsbg.oreb,
+        tsbg.dreb,
+        tsbg.reb,
+        tsbg.ast,
+        tsbg.stl,
+        tsbg.blk,
+        tsbg."to",
+        tsbg.pf,
+        tsbg.pts,
+        tsbg.plus_minus,
+        gls.pts_qtr1,
+        gls.pts_qtr2,
+        gls.pts_qtr3,
+        gls.pts_qtr4,
+        gls.pts_ot1+gls.pts_ot2+gls.pts_ot3+gls.pts_ot4+gls.pts_ot5+gls.pts_ot6+gls.pts_ot7+gls.pts_ot8+gls.pts_ot9+gls.pts_ot10 as pts_total_ot
+    from all_teams_in_games
+    join team_stats_by_game tsbg
+    on tsbg.game_id = all_teams_in_games.game_id and
+    tsbg.team_id = all_teams_in_games.team_id
+    join game_line_scores gls
+    on gls.game_id = all_teams_in_games.game_id and
+    gls.team_id = all_teams_in_games.team_id
+    """).bindparams(bindparam("team_ids", expanding=True))
+
+
+def refresh_team_game_log(connection, team_ids):
+    """Rebuild the game log rows of the given teams.
+
+    Game numbers and home/away counts are running totals over a team's whole
+    season, so a team's rows are recomputed together whenever it plays.
+    """
+    team_ids = sorted(set(team_ids))
+    if not team_ids:
+        return 0
+
+    connection.execute(
+        delete(TeamGameLog.__table__).where(TeamGameLog.team_id.in_(team_ids))
+    )
+    result = connection.execute(
+        insert(TeamGameLog.__table__).from_select(
+            team_game_log_columns,
+            team_game_log_query.columns(*team_game_log_columns),
+        ),
+        {"team_ids": team_ids},
+    )
+    return result.rowcount
+
+
+def rebuild_team_game_log(connection):
+    team_ids = connection.execute(
+        union(select(GameHeaders.home_team_id), select(GameHeaders.visitor_team_id))
+    ).scalars()
+    return refresh_team_game_log(connection, list(team_ids))
+
+
+def shot_rows(actions):
+    return [
+        {
+            "game_id": action["game_id"],
+            "action_number": action["actionNumber"],
+            "player_id": action["personId"],
+            "team_id": action.get("teamId"),
+            "x": action.get("x"),
+            "y": action.get("y"),
+            "made": action.get("shotResult") == "Made",
+            "shot_type": action["actionType"],
+            "sub_type": action.get("subType"),
+            "shot_distance": action.get("shotDistance"),
+            "area": action.get("area"),
+        }
+        for action in actions
+    ]
+
+
+def rebuild_shots(connection):
+    """Repopulate shots from the two_point and threepoint tables, for databases
+    loaded before the ETL maintained it."""
+    shot_selects = [
+        select(
+            table_model.game_id,
+            table_model.actionNumber,
+            table_model.personId,
+            table_model.teamId,
+            table_model.x,
+            table_model.y,
+            table_model.shotResult == "Made",
+            literal(shot_type),
+            table_model.subType,
+            table_model.shotDistance,
+            table_model.area,
+        ).where(table_model.personId.is_not(None))
+        for shot_type, table_model in (("2pt", TwoPoint), ("3pt", ThreePoint))
+    ]
+    connection.execute(delete(Shot.__table__))
+    result = connection.execute(
+        insert(Shot.__table__).from_select(
+            [column.name for column in Shot.__table__.columns],
+            union_all(*shot_selects),
+        )
+    )
+    return result.rowcount
+
+
+def main():
+    with get_engine(DATABASE_URL).begin() as connection:
+        rebuild_team_game_log(connection)
+        rebuild_shots(connection)
+
+
+if __name__ == "__main__":
+    main()
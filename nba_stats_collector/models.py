@@ -3,10 +3,12 @@ from sqlalchemy import (
     Column,
     Integer,
     String,
+    Date,
     DateTime,
     ForeignKey,
     Float,
     Boolean,
+    Index,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -29,14 +31,16 @@ class Team(Base):
 class GameHeaders(Base):
     __tablename__ = "game_headers"
 
-    game_date_est = Column(DateTime, nullable=False)
+    game_date_est = Column(DateTime, nullable=False, index=True)
     game_sequence = Column(Integer, nullable=False)
     game_id = Column(String, nullable=False, unique=True, primary_key=True)
     game_status_id = Column(Integer, nullable=False)
     game_status_text = Column(String, nullable=False)
     gamecode = Column(String, nullable=False)
-    home_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
-    visitor_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    home_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
+    visitor_team_id = Column(
+        Integer, ForeignKey("teams.id"), nullable=False, index=True
+    )
     season = Column(String, nullable=False)
     live_period = Column(Integer, nullable=False)
     live_pc_time = Column(String, nullable=True)
@@ -161,7 +165,7 @@ class PlayerStatsByGame(Base):
     game_id = Column(
         String, ForeignKey("game_headers.game_id"), nullable=False, primary_key=True
     )
-    player_id = Column(Integer, nullable=False, primary_key=True)
+    player_id = Column(Integer, nullable=False, primary_key=True, index=True)
     team_id = Column(Integer, nullable=False)
     player_name = Column(String, nullable=False)
     start_position = Column(String, nullable=False)
@@ -197,7 +201,7 @@ class TeamStatsByGame(Base):
     game_id = Column(
         String, ForeignKey("game_headers.game_id"), nullable=False, primary_key=True
     )
-    team_id = Column(Integer, nullable=False, primary_key=True)
+    team_id = Column(Integer, nullable=False, primary_key=True, index=True)
     min = Column(String)
     fgm = Column(Integer)
     fga = Column(Integer)
@@ -267,7 +271,7 @@ class Period(Base):
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Float)
     y = Column(Float)
     possession = Column(Integer)
@@ -291,13 +295,13 @@ class Jumpball(Base):
     timeActual = Column(String)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     descriptor = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Float)
     y = Column(Float)
     possession = Column(Integer)
@@ -329,12 +333,12 @@ class Turnover(Base):
     timeActual = Column(String)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Float)
     y = Column(Float)
     area = Column(String)
@@ -367,11 +371,11 @@ class Steal(Base):
     timeActual = Column(String)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Float)
     y = Column(Float)
     area = Column(String)
@@ -403,13 +407,13 @@ class TwoPoint(Base):
     timeActual = Column(String)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     descriptor = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Float)
     y = Column(Float)
     area = Column(String)
@@ -447,13 +451,13 @@ class Foul(Base):
     timeActual = Column(DateTime)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     descriptor = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Float)
     y = Column(Float)
     area = Column(String)
@@ -487,12 +491,12 @@ class FreeThrow(Base):
     timeActual = Column(DateTime)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Float)
     y = Column(Float)
     side = Column(String)
@@ -522,12 +526,12 @@ class ThreePoint(Base):
     timeActual = Column(String)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Float)
     y = Column(Float)
     area = Column(String)
@@ -565,12 +569,12 @@ class Rebound(Base):
     timeActual = Column(DateTime)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(String)
     y = Column(String)
     area = Column(String)
@@ -603,12 +607,12 @@ class Block(Base):
     timeActual = Column(DateTime)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(String)
     y = Column(String)
     area = Column(String)
@@ -637,12 +641,12 @@ class Timeout(Base):
     timeActual = Column(DateTime)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(String)
     y = Column(String)
     possession = Column(Integer)
@@ -667,12 +671,12 @@ class Substitution(Base):
     timeActual = Column(DateTime)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Integer)
     y = Column(Integer)
     possession = Column(Integer)
@@ -699,12 +703,12 @@ class Violation(Base):
     timeActual = Column(DateTime)
     period = Column(Integer)
     periodType = Column(String)
-    teamId = Column(Integer)
+    teamId = Column(Integer, index=True)
     teamTricode = Column(String)
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Integer)
     y = Column(Integer)
     possession = Column(Integer)
@@ -735,7 +739,7 @@ class Game(Base):
     actionType = Column(String)
     subType = Column(String)
     qualifiers = Column(String)
-    personId = Column(Integer)
+    personId = Column(Integer, index=True)
     x = Column(Integer)
     y = Column(Integer)
     possession = Column(Integer)
@@ -749,3 +753,175 @@ class Game(Base):
     side = Column(String)
     description = Column(String)
     personIdsFilter = Column(String)
+
+
+class PlayByPlayEvent(Base):
+    """Every play-by-play action in one table, whatever its actionType."""
+
+    __tablename__ = "pbp_events"
+    __table_args__ = (
+        Index("ix_pbp_events_game_id_action_type", "game_id", "actionType"),
+        Index("ix_pbp_events_person_id", "personId"),
+        Index("ix_pbp_events_team_id_period", "teamId", "period"),
+    )
+
+    game_id = Column(String, primary_key=True)
+    actionNumber = Column(Integer, primary_key=True)
+    orderNumber = Column(Integer)
+    actionType = Column(String, nullable=False)
+    subType = Column(String)
+    descriptor = Column(String)
+    qualifiers = Column(String)
+    clock = Column(String)
+    timeActual = Column(DateTime)
+    edited = Column(DateTime)
+    period = Column(Integer)
+    periodType = Column(String)
+    teamId = Column(Integer)
+    teamTricode = Column(String)
+    personId = Column(Integer)
+    playerName = Column(String)
+    playerNameI = Column(String)
+    personIdsFilter = Column(String)
+    possession = Column(Integer)
+    scoreHome = Column(String)
+    scoreAway = Column(String)
+    x = Column(Float)
+    y = Column(Float)
+    xLegacy = Column(Float)
+    yLegacy = Column(Float)
+    area = Column(String)
+    areaDetail = Column(String)
+    side = Column(String)
+    isFieldGoal = Column(Integer)
+    shotDistance = Column(Float)
+    shotResult = Column(String)
+    shotActionNumber = Column(Integer)
+    pointsTotal = Column(Integer)
+    description = Column(String)
+    assistPlayerNameInitial = Column(String)
+    assistPersonId = Column(Integer)
+    assistTotal = Column(Integer)
+    blockPlayerName = Column(String)
+    blockPersonId = Column(Integer)
+    jumpBallRecoveredName = Column(String)
+    jumpBallRecoverdPersonId = Column(Integer)
+    jumpBallWonPlayerName = Column(String)
+    jumpBallWonPersonId = Column(Integer)
+    jumpBallLostPlayerName = Column(String)
+    jumpBallLostPersonId = Column(Integer)
+    turnoverTotal = Column(Integer)
+    stealPlayerName = Column(String)
+    stealPersonId = Column(Integer)
+    officialId = Column(Integer)
+    foulPersonalTotal = Column(Integer)
+    foulTechnicalTotal = Column(Integer)
+    foulDrawnPlayerName = Column(String)
+    foulDrawnPersonId = Column(Integer)
+    reboundTotal = Column(Integer)
+    reboundDefensiveTotal = Column(Integer)
+    reboundOffensiveTotal = Column(Integer)
+
+
+playbyplay_action_models = {
+    "period": Period,
+    "jumpball": Jumpball,
+    "turnover": Turnover,
+    "steal": Steal,
+    "2pt": TwoPoint,
+    "foul": Foul,
+    "freethrow": FreeThrow,
+    "3pt": ThreePoint,
+    "rebound": Rebound,
+    "block": Block,
+    "timeout": Timeout,
+    "substitution": Substitution,
+    "violation": Violation,
+    "game": Game,
+}
+
+
+class TeamGameLog(Base):
+    """Per-team game log derived from game headers, boxscores and line scores."""
+
+    __tablename__ = "team_game_log"
+
+    team_id = Column(Integer, primary_key=True)
+    game_id = Column(String, primary_key=True)
+    game_date_est = Column(DateTime, nullable=False)
+    home_or_away = Column(String, nullable=False)
+    game_number = Column(Integer, nullable=False)
+    home_games_count = Column(Integer, nullable=False)
+    away_games_count = Column(Integer, nullable=False)
+    team_name = Column(String)
+    fgm = Column(Integer)
+    fga = Column(Integer)
+    fg_pct = Column(Float)
+    fg3m = Column(Integer)
+    fg3a = Column(Integer)
+    fg3_pct = Column(Float)
+    ftm = Column(Integer)
+    fta = Column(Integer)
+    ft_pct = Column(Float)
+    oreb = Column(Integer)
+    dreb = Column(Integer)
+    reb = Column(Integer)
+    ast = Column(Integer)
+    stl = Column(Integer)
+    blk = Column(Integer)
+    to = Column(Integer)
+    pf = Column(Integer)
+    pts = Column(Integer)
+    plus_minus = Column(Float)
+    pts_qtr1 = Column(Integer)
+    pts_qtr2 = Column(Integer)
+    pts_qtr3 = Column(Integer)
+    pts_qtr4 = Column(Integer)
+    pts_total_ot = Column(Integer)
+
+
+class Shot(Base):
+    """Field goal attempts from the 2pt and 3pt play-by-play actions."""
+
+    __tablename__ = "shots"
+
+    game_id = Column(String, primary_key=True)
+    action_number = Column(Integer, primary_key=True)
+    player_id = Column(Integer, nullable=False, index=True)
+    team_id = Column(Integer)
+    x = Column(Float)
+    y = Column(Float)
+    made = Column(Boolean, nullable=False)
+    shot_type = Column(String, nullable=False)
+    sub_type = Column(String)
+    shot_distance = Column(Float)
+    area = Column(String)
+
+
+class PlayByPlayWatermark(Base):
+    __tablename__ = "playbyplay_watermarks"
+
+    game_id = Column(String, primary_key=True)
+    action_number = Column(Integer, nullable=False)
+    order_number = Column(Integer, nullable=False)
+    edited = Column(String, nullable=False)  # ISO timestamp, compared as text
+    updated_at = Column(DateTime, nullable=False)
+
+
+class DataVersion(Base):
+    """Single-row stamp bumped at the end of every ETL load."""
+
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class BackfillCheckpoint(Base):
+    __tablename__ = "backfill_checkpoints"
+
+    game_date = Column(Date, primary_key=True)
+    game_id = Column(String, primary_key=True)  # "" for day-level stages
+    stage = Column(String, primary_key=True)
+    completed_at = Column(DateTime, nullable=False)
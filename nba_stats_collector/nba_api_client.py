@@ -1,84 +1,257 @@
+from collections import defaultdict
+from datetime import date, timedelta
+import pandas as pd
 from nba_api.stats.endpoints import scoreboard, boxscoretraditionalv2
 from nba_api.live.nba.endpoints import playbyplay
 from nba_api.stats.static import teams
+from nba_stats_collector.cache import ResponseCache
+from nba_stats_collector.transport import create_transport
+from nba_stats_collector.config import (
+    NBA_API_CACHE_DIR,
+    NBA_API_CACHE_MAX_MB,
+    NBA_API_CACHE_TTL_LIVE,
+    NBA_API_CACHE_TTL_SCHEDULED,
+)
+
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_LIVE = 2
+GAME_STATUS_FINAL = 3
+
+response_cache = (
+    ResponseCache(NBA_API_CACHE_DIR, NBA_API_CACHE_MAX_MB * 1024 * 1024)
+    if NBA_API_CACHE_DIR
+    else None
+)
+
+# Created on first use, see get_default_transport
+default_transport = None
+
+
+def get_default_transport():
+    global default_transport
+    if default_transport is None:
+        default_transport = create_transport()
+    return default_transport
+
+
+def status_ttl(game_status_id):
+    if game_status_id == GAME_STATUS_FINAL:
+        return None
+    if game_status_id == GAME_STATUS_SCHEDULED:
+        return NBA_API_CACHE_TTL_SCHEDULED
+    return NBA_API_CACHE_TTL_LIVE
+
+
+def scoreboard_ttl(payload):
+    game_header = payload["resultSets"][0]
+    position = [header.lower() for header in game_header["headers"]].index(
+        "game_status_id"
+    )
+    statuses = {row[position] for row in game_header["rowSet"]}
+    if GAME_STATUS_LIVE in statuses:
+        return NBA_API_CACHE_TTL_LIVE
+    if statuses - {GAME_STATUS_FINAL}:
+        return NBA_API_CACHE_TTL_SCHEDULED
+    return None
+
+
+def is_game_over(actions):
+    if not actions:
+        return False
+    last_action = actions[-1]
+    return last_action["actionType"] == "game" and last_action.get("subType") == "end"
+
+
+def playbyplay_ttl(game_status_id):
+    def ttl(payload):
+        if is_game_over(payload["game"]["actions"]):
+            return None
+        return status_ttl(game_status_id)
+
+    return ttl
+
+
+def fetch_endpoint(endpoint_class, ttl=None, transport=None, **params):
+    """Return an endpoint's JSON payload, going through the response cache when
+    it is enabled. ``ttl`` is seconds, ``None`` for forever, or a callable that
+    derives either from the payload; 0 bypasses the cache. ``transport``
+    defaults to the one set by NBA_API_TRANSPORT."""
+    endpoint = f"{endpoint_class.__module__}.{endpoint_class.__name__}"
+    if response_cache is not None and ttl != 0:
+        payload = response_cache.get(endpoint, params)
+        if payload is not None:
+            return payload
+
+    transport = transport or get_default_transport()
+    payload = transport.get(endpoint_class, params)
+    if response_cache is not None and ttl != 0:
+        response_cache.set(
+            endpoint, params, payload, ttl(payload) if callable(ttl) else ttl
+        )
+    return payload
 
 
 class StatsEndpoints:
-    def process_endpoint_data(self, index):
+    def get_result_set(self, index):
         result_data = self.endpoint_result_dict[index]
-
-        games_data_list = []
-        for game in result_data["rowSet"]:
-            single_game_data = {}
-            for stat, value in zip(result_data["headers"], game):
-                single_game_data[stat.lower()] = value
-            games_data_list.append(single_game_data)
-
-        return games_data_list
+        headers = [header.lower() for header in result_data["headers"]]
+        return headers, result_data["rowSet"]
+
+    def process_endpoint_data(self, index, orient="records"):
+        """Decode a result set.
+
+        ``orient`` selects the shape: "records" (list of dicts), "tuples"
+        (``(headers, rows)`` with each row a tuple), "columns" (dict of lists)
+        or "frame" (pandas DataFrame).
+        """
+        headers, rows = self.get_result_set(index)
+
+        if orient == "records":
+            return [dict(zip(headers, row)) for row in rows]
+        if orient == "tuples":
+            return headers, [tuple(row) for row in rows]
+        if orient == "columns":
+            columns = zip(*rows) if rows else [[] for _ in headers]
+            return {header: list(column) for header, column in zip(headers, columns)}
+        if orient == "frame":
+            return pd.DataFrame(rows, columns=headers)
+        raise ValueError(f"Unknown orient {orient!r}")
 
 
 class NBAGames(StatsEndpoints):
-    def __init__(self, day_offset=0):
-        self.endpoint_result_dict = scoreboard.Scoreboard(
-            day_offset=day_offset
-        ).get_dict()["resultSets"]
-
-    def get_game_header(self):
-        return self.process_endpoint_data(0)
-
-    def get_game_line_score(self):
-        return self.process_endpoint_data(1)
-
-    def get_series_standings(self):
-        return self.process_endpoint_data(2)
-
-    def get_last_meeting(self):
-        return self.process_endpoint_data(3)
-
-    def get_east_standing(self):
-        return self.process_endpoint_data(4)
-
-    def get_west_standing(self):
-        return self.process_endpoint_data(5)
+    def __init__(self, day_offset=0, game_date=None, payload=None, transport=None):
+        # Resolve the offset to a date so cached scoreboards stay keyed on the
+        # day they describe.
+        if game_date is None:
+            game_date = date.today() + timedelta(days=day_offset)
+        self.game_date = game_date
+        # A payload fetched earlier, e.g. from an ArtifactStore, skips the request
+        if payload is None:
+            payload = fetch_endpoint(
+                scoreboard.Scoreboard,
+                scoreboard_ttl,
+                transport,
+                day_offset=0,
+                game_date=game_date.isoformat(),
+            )
+        self.payload = payload
+        self.endpoint_result_dict = payload["resultSets"]
+
+    def get_game_header(self, orient="records"):
+        return self.process_endpoint_data(0, orient)
+
+    def get_game_line_score(self, orient="records"):
+        return self.process_endpoint_data(1, orient)
+
+    def get_series_standings(self, orient="records"):
+        return self.process_endpoint_data(2, orient)
+
+    def get_last_meeting(self, orient="records"):
+        return self.process_endpoint_data(3, orient)
+
+    def get_east_standing(self, orient="records"):
+        return self.process_endpoint_data(4, orient)
+
+    def get_west_standing(self, orient="records"):
+        return self.process_endpoint_data(5, orient)
 
     def get_games_list(self):
-        return [game["game_id"] for game in self.get_game_header()]
+        return self.get_game_header(orient="columns")["game_id"]
+
+    def get_game_statuses(self):
+        game_header = self.get_game_header(orient="columns")
+        return dict(zip(game_header["game_id"], game_header["game_status_id"]))
 
 
 class NBAGameStats(StatsEndpoints):
-    def __init__(self, game_id):
-        self.endpoint_result_dict = boxscoretraditionalv2.BoxScoreTraditionalV2(
-            game_id=game_id
-        ).get_dict()["resultSets"]
+    def __init__(self, game_id, game_status_id=None, payload=None, transport=None):
+        self.game_id = game_id
+        if payload is None:
+            payload = fetch_endpoint(
+                boxscoretraditionalv2.BoxScoreTraditionalV2,
+                status_ttl(game_status_id),
+                transport,
+                game_id=game_id,
+            )
+        self.payload = payload
+        self.endpoint_result_dict = payload["resultSets"]
 
-    def get_player_stats(self):
-        return self.process_endpoint_data(0)
+    def get_player_stats(self, orient="records"):
+        return self.process_endpoint_data(0, orient)
 
-    def get_team_stats(self):
-        return self.process_endpoint_data(1)
+    def get_team_stats(self, orient="records"):
+        return self.process_endpoint_data(1, orient)
 
-    def get_starter_bench_stats(self):
-        return self.process_endpoint_data(2)
+    def get_starter_bench_stats(self, orient="records"):
+        return self.process_endpoint_data(2, orient)
 
 
 class NBAPlayByPlay:
-    def __init__(self, game_id):
+    def __init__(
+        self,
+        game_id,
+        game_status_id=None,
+        watermark=None,
+        payload=None,
+        transport=None,
+        ttl=None,
+    ):
         self.game_id = game_id
-        self.actions = playbyplay.PlayByPlay(game_id=self.game_id).get_dict()["game"][
-            "actions"
-        ]
+        self.watermark = watermark
+        if payload is None:
+            payload = fetch_endpoint(
+                playbyplay.PlayByPlay,
+                playbyplay_ttl(game_status_id) if ttl is None else ttl,
+                transport,
+                game_id=game_id,
+            )
+        self.payload = payload
+        self.actions = payload["game"]["actions"]
         self.get_play_by_play()
 
     def get_play_by_play(self):
-        self.game_actions = []
-
-        for action in self.actions:
-            mod_action = {"game_id": self.game_id}
-            mod_action.update(action)
-            self.game_actions.append(mod_action)
+        # Tag and bucket the actions in a single pass; the action dicts are
+        # updated in place rather than copied. With a watermark only actions
+        # past it, or edited since it was taken, are kept.
+        self.game_actions = self.actions
+        if self.watermark is not None:
+            action_number, edited = self.watermark
+            self.game_actions = [
+                action
+                for action in self.actions
+                if action["actionNumber"] > action_number
+                or (action.get("edited") or "") > edited
+            ]
+        self.actions_by_type = defaultdict(list)
+
+        for action in self.game_actions:
+            action["game_id"] = self.game_id
+            self.actions_by_type[action["actionType"]].append(action)
+
+        return self.game_actions
+
+    def is_final(self):
+        return is_game_over(self.actions)
+
+    def get_watermark(self):
+        return {
+            "game_id": self.game_id,
+            "action_number": max(
+                (action["actionNumber"] for action in self.actions), default=0
+            ),
+            "order_number": max(
+                (action.get("orderNumber") or 0 for action in self.actions), default=0
+            ),
+            "edited": max(
+                (action.get("edited") or "" for action in self.actions), default=""
+            ),
+        }
+
+    def iter_actions(self):
+        yield from self.actions_by_type.items()
 
     def get_specific_action(self, action_type):
-        return [play for play in self.game_actions if play["actionType"] == action_type]
+        return self.actions_by_type.get(action_type, [])
 
     def get_period(self):
         return self.get_specific_action("period")
@@ -96,7 +269,7 @@ class NBAPlayByPlay:
         return self.get_specific_action("2pt")
 
     def get_foul(self):
-        return self.get_specific_action("2pt")
+        return self.get_specific_action("foul")
 
     def get_freethrow(self):
         return self.get_specific_action("freethrow")
@@ -0,0 +1,235 @@
+import argparse
+import logging
+import os
+from datetime import date, datetime
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    inspect,
+    or_,
+    select,
+)
+from nba_stats_collector.atomic import atomic_path
+from nba_stats_collector.config import DATABASE_URL, PARQUET_EXPORT_DIR
+from nba_stats_collector.database import get_engine
+from nba_stats_collector.models import (
+    BackfillCheckpoint,
+    Base,
+    DataVersion,
+    GameHeaders,
+    PlayByPlayWatermark,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+# Bookkeeping tables that are not worth archiving
+skipped_tables = {
+    BackfillCheckpoint.__tablename__,
+    DataVersion.__tablename__,
+    PlayByPlayWatermark.__tablename__,
+}
+
+# Columns that date a row on their own; other tables with a game_id are dated
+# through game_headers.
+partition_date_columns = ("game_date_est", "standingsdate")
+
+
+def season_for_date(game_date):
+    """Return the season a game date belongs to, e.g. "2022-23"."""
+    start_year = game_date.year if game_date.month >= 9 else game_date.year - 1
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+def partition_date_column(table):
+    for name in partition_date_columns:
+        if name in table.columns:
+            return table.columns[name]
+    if "game_id" in table.columns and table.name != GameHeaders.__tablename__:
+        return GameHeaders.__table__.columns["game_date_est"]
+    return None
+
+
+def exported_tables(engine):
+    existing = set(inspect(engine).get_table_names())
+    return [
+        table
+        for table in Base.metadata.sorted_tables
+        if table.name in existing and table.name not in skipped_tables
+    ]
+
+
+def partitioned_rows(connection, table, game_dates):
+    """Return ``{game_date: rows}`` for the rows of the table played on the
+    given dates, each row a dict of the table's columns."""
+    date_column = partition_date_column(table)
+    statement = select(table, date_column.label("_partition_date"))
+    if date_column.table is not table:
+        statement = statement.join(
+            date_column.table,
+            date_column.table.columns["game_id"] == table.columns["game_id"],
+        )
+    statement = statement.where(
+        or_(
+            *[
+                date_column.between(
+                    datetime.combine(game_date, datetime.min.time()),
+                    datetime.combine(game_date, datetime.max.time()),
+                )
+                for game_date in game_dates
+            ]
+        )
+    )
+
+    partitions = {game_date: [] for game_date in game_dates}
+    for row in connection.execute(statement).mappings():
+        row = dict(row)
+        partition_date = row.pop("_partition_date")
+        if isinstance(partition_date, datetime):
+            partition_date = partition_date.date()
+        partitions[partition_date].append(row)
+    return partitions
+
+
+def arrow_type(column):
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, String):
+        return pa.string()
+    raise TypeError(f"No Parquet type for {column.table.name}.{column.name}")
+
+
+def arrow_schema(table):
+    return pa.schema(
+        [
+            pa.field(column.name, arrow_type(column), nullable=column.nullable)
+            for column in table.columns
+        ]
+    )
+
+
+class ParquetExporter:
+    """Archive the warehouse tables as Parquet files under ``export_dir``.
+
+    Tables that can be dated are written to one file per game date,
+    ``<table>/season=2022-23/game_date=2023-04-09/part-0.parquet``, so a run
+    only rewrites the dates it loaded. Other tables, like teams, are written
+    whole to ``<table>/part-0.parquet``. The files can be read memory-mapped
+    with ``pyarrow.dataset.dataset(path, partitioning="hive")``.
+    """
+
+    def __init__(self, engine, export_dir=PARQUET_EXPORT_DIR):
+        if pa is None:
+            raise ImportError("Parquet exports require pyarrow: pip install pyarrow")
+        self.engine = engine
+        self.export_dir = export_dir
+
+    def game_dates_for(self, game_ids):
+        """Return the dates of the given games, or of every game for None."""
+        statement = select(GameHeaders.game_date_est).distinct()
+        if game_ids is not None:
+            if not game_ids:
+                return set()
+            statement = statement.where(GameHeaders.game_id.in_(list(game_ids)))
+        with self.engine.connect() as connection:
+            return {
+                game_date.date() if isinstance(game_date, datetime) else game_date
+                for game_date in connection.execute(statement).scalars()
+            }
+
+    def all_game_dates(self):
+        return self.game_dates_for(None)
+
+    def export(self, game_dates):
+        """Rewrite the partitions of the given dates and the undated tables.
+        Returns the number of rows written."""
+        game_dates = sorted(game_dates)
+        counter = 0
+        with self.engine.connect() as connection:
+            for table in exported_tables(self.engine):
+                if partition_date_column(table) is None:
+                    rows = [
+                        dict(row)
+                        for row in connection.execute(select(table)).mappings()
+                    ]
+                    counter += self.write(table, rows, table.name)
+                    continue
+                if not game_dates:
+                    continue
+                partitions = partitioned_rows(connection, table, game_dates)
+                for game_date, rows in partitions.items():
+                    counter += self.write(
+                        table, rows, self.partition_path(table, game_date)
+                    )
+
+        logger.info(
+            f"Exported {counter} rows for {len(game_dates)} game dates to {self.export_dir}."
+        )
+        return counter
+
+    @staticmethod
+    def partition_path(table, game_date):
+        return os.path.join(
+            table.name,
+            f"season={season_for_date(game_date)}",
+            f"game_date={game_date.isoformat()}",
+        )
+
+    def write(self, table, rows, partition_path):
+        directory = os.path.join(self.export_dir, partition_path)
+        path = os.path.join(directory, "part-0.parquet")
+        if not rows:
+            if os.path.exists(path):
+                os.remove(path)
+            return 0
+
+        os.makedirs(directory, exist_ok=True)
+        with atomic_path(path) as temp_path:
+            pq.write_table(
+                pa.Table.from_pylist(rows, schema=arrow_schema(table)), temp_path
+            )
+        return len(rows)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description="Export NBA stats tables to Parquet.")
+    parser.add_argument("--export-dir", default=PARQUET_EXPORT_DIR)
+    parser.add_argument("--start-date", type=date.fromisoformat)
+    parser.add_argument("--end-date", type=date.fromisoformat)
+    parsed = parser.parse_args(args)
+    if not parsed.export_dir:
+        parser.error("--export-dir is required when PARQUET_EXPORT_DIR is not set")
+    return parsed
+
+
+def main(args=None):
+    parsed = parse_args(args)
+    exporter = ParquetExporter(get_engine(DATABASE_URL), parsed.export_dir)
+    game_dates = exporter.all_game_dates()
+    if parsed.start_date:
+        game_dates = {day for day in game_dates if day >= parsed.start_date}
+    if parsed.end_date:
+        game_dates = {day for day in game_dates if day <= parsed.end_date}
+    exporter.export(game_dates)
+
+
+if __name__ == "__main__":
+    main()
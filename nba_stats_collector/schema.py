@@ -0,0 +1,103 @@
+import logging
+from sqlalchemy import inspect, select, text
+from nba_stats_collector.config import DATABASE_URL, ETL_PBP_STORAGE
+from nba_stats_collector.database import get_engine
+from nba_stats_collector.models import (
+    Base,
+    PlayByPlayEvent,
+    playbyplay_action_models,
+)
+
+logger = logging.getLogger(__name__)
+
+pbp_storage_modes = ("tables", "events")
+
+
+def create_schema(engine, pbp_storage="tables"):
+    """Create the tables for the chosen play-by-play storage.
+
+    With "tables" every action type keeps its own table. With "events" all
+    actions go to ``pbp_events`` and the per-type tables are replaced by views
+    of the same name, so existing queries keep working.
+    """
+    if pbp_storage not in pbp_storage_modes:
+        raise ValueError(
+            f"Unknown pbp_storage {pbp_storage!r}, expected one of {pbp_storage_modes}"
+        )
+    if pbp_storage == "tables":
+        Base.metadata.create_all(engine)
+    else:
+        split_tables = {model.__table__ for model in playbyplay_action_models.values()}
+        Base.metadata.create_all(
+            engine,
+            tables=[
+                table
+                for table in Base.metadata.sorted_tables
+                if table not in split_tables
+            ],
+        )
+        create_compatibility_views(engine)
+
+    create_missing_indexes(engine)
+
+
+def create_missing_indexes(engine):
+    """Create declared indexes that an existing database predates.
+
+    ``create_all`` only indexes the tables it creates, so databases built
+    before an index was declared pick it up here.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    created = 0
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_indexes = {
+            index["name"] for index in inspector.get_indexes(table.name)
+        }
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            index.create(engine)
+            created += 1
+            logger.info(f"Created index {index.name} on {table.name}.")
+
+    return created
+
+
+def compatibility_view_query(action_type, table_model):
+    events = PlayByPlayEvent.__table__
+    return select(
+        *[events.c[column.name] for column in table_model.__table__.columns]
+    ).where(events.c.actionType == action_type)
+
+
+def create_compatibility_views(engine):
+    inspector = inspect(engine)
+    existing_names = set(inspector.get_table_names()) | set(inspector.get_view_names())
+
+    with engine.begin() as connection:
+        for action_type, table_model in playbyplay_action_models.items():
+            view_name = table_model.__tablename__
+            if view_name in existing_names:
+                logger.warning(
+                    f"Skipping compatibility view {view_name}, the name is already in use."
+                )
+                continue
+
+            query = compatibility_view_query(action_type, table_model).compile(
+                engine, compile_kwargs={"literal_binds": True}
+            )
+            quoted_name = engine.dialect.identifier_preparer.quote(view_name)
+            connection.execute(text(f"CREATE VIEW {quoted_name} AS {query}"))
+
+
+def main():
+    create_schema(get_engine(DATABASE_URL), ETL_PBP_STORAGE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from requests import HTTPError
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket shared across threads: calls start at ``rate`` per second on
+    average, with bursts of up to ``burst`` calls. A rate of 0 disables it."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def wait(self):
+        if not self.rate:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._tokens + (now - self._updated) * self.rate, self.burst
+            )
+            self._updated = now
+            # A negative balance reserves the next free slot for this call
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait_time:
+            time.sleep(wait_time)
+
+
+_shared_rate_limiters = {}
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter(rate, burst=1):
+    """Return the process-wide limiter for ``rate`` and ``burst``, so every ETL,
+    backfill and live poller in the process draws from the same bucket."""
+    with _shared_lock:
+        key = (rate, burst)
+        if key not in _shared_rate_limiters:
+            _shared_rate_limiters[key] = RateLimiter(rate, burst)
+        return _shared_rate_limiters[key]
+
+
+class CircuitBreaker:
+    """Pause calls for ``cooldown`` seconds once at least ``error_rate`` of the
+    last ``window`` calls failed, across threads.
+
+    After the pause the next result decides: a failure opens the breaker again
+    straight away, a success closes it. A window of 0 disables it.
+    """
+
+    def __init__(self, window=20, error_rate=0.5, cooldown=60.0):
+        self.window = window
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._results = deque(maxlen=window or None)
+        self._open_until = 0.0
+        self._half_open = False
+
+    @property
+    def is_open(self):
+        return time.monotonic() < self._open_until
+
+    def wait(self):
+        with self._lock:
+            wait_time = max(self._open_until - time.monotonic(), 0.0)
+        if wait_time:
+            time.sleep(wait_time)
+
+    def record(self, success):
+        if not self.window:
+            return
+
+        with self._lock:
+            if self._half_open:
+                self._half_open = False
+                if not success:
+                    self._open()
+                return
+
+            self._results.append(success)
+            failures = self._results.count(False)
+            if (
+                len(self._results) == self.window
+                and failures >= self.error_rate * self.window
+            ):
+                self._open()
+
+    def _open(self):
+        logger.warning(
+            f"NBA API error rate too high, pausing requests for {self.cooldown}s."
+        )
+        self._open_until = time.monotonic() + self.cooldown
+        self._half_open = True
+        self._results.clear()
+
+
+class RetryPolicy:
+    """Retry transient failures up to ``max_retries`` times, sleeping a random
+    delay of up to ``base_delay * 2 ** attempt`` seconds, capped at
+    ``max_delay``, before each retry."""
+
+    def __init__(self, max_retries=3, base_delay=1.0, max_delay=30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.base_delay * 2**attempt, self.max_delay))
+
+
+def is_retryable(error):
+    """Connection errors, timeouts, throttling (429) and server errors are
+    transient; other HTTP errors and bad payloads are not."""
+    if isinstance(error, HTTPError) and error.response is not None:
+        status_code = error.response.status_code
+        return status_code == 429 or status_code >= 500
+    # requests' JSONDecodeError is an OSError as well as a ValueError
+    if isinstance(error, ValueError):
+        return False
+    return isinstance(error, OSError)
@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from nba_api.live.nba.library.http import NBALiveHTTP
+from nba_api.stats.library.http import NBAStatsHTTP
+from nba_stats_collector.config import (
+    NBA_API_POOL_SIZE,
+    NBA_API_TIMEOUT_SECONDS,
+    NBA_API_TRANSPORT,
+)
+
+
+class EndpointTransport:
+    """Let the nba_api endpoint classes make their own requests, one
+    connection per request."""
+
+    def get(self, endpoint_class, params):
+        return endpoint_class(**params).get_dict()
+
+
+class HTTPTransport:
+    """Request the NBA endpoints over a pooled keep-alive session.
+
+    The nba_api endpoint classes are only used to build the URL and query
+    parameters. ``base_urls`` overrides the "stats" and "live" base URLs,
+    e.g. to point at a ``FakeNBAServer``; by default they are read from
+    nba_api on every request.
+    """
+
+    def __init__(
+        self,
+        base_urls=None,
+        pool_size=NBA_API_POOL_SIZE,
+        timeout=NBA_API_TIMEOUT_SECONDS,
+    ):
+        self.base_urls = base_urls or {}
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, endpoint_class, params):
+        """Return the ``(url, query parameters, headers)`` of a request."""
+        endpoint = endpoint_class(**params, get_request=False)
+        if hasattr(endpoint, "endpoint_url"):
+            base_url = self.base_urls.get("live", NBALiveHTTP.base_url)
+            path = endpoint.endpoint_url.format(**vars(endpoint))
+            return base_url.format(endpoint=path), [], NBALiveHTTP.headers
+
+        base_url = self.base_urls.get("stats", NBAStatsHTTP.base_url)
+        # stats.nba.com is sensitive to the parameter order, as in nba_api
+        parameters = sorted(endpoint.parameters.items())
+        return (
+            base_url.format(endpoint=endpoint.endpoint),
+            parameters,
+            NBAStatsHTTP.headers,
+        )
+
+    def get(self, endpoint_class, params):
+        url, parameters, headers = self.request(endpoint_class, params)
+        response = self.session.get(
+            url, params=parameters, headers=headers, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+
+class ReplayTransport:
+    """Serve recorded payloads instead of calling the NBA API.
+
+    Payloads are looked up by endpoint class name, first in ``payloads``
+    (a payload or a callable taking the endpoint parameters) and then in
+    ``fixtures_dir``, preferring a per-game ``<name>_<game_id>.json`` over
+    ``<name>.json``. With ``recorded_game_id`` a shared fixture is relabelled
+    as the requested game.
+    """
+
+    fixture_names = {
+        "Scoreboard": "scoreboard",
+        "BoxScoreTraditionalV2": "boxscore",
+        "PlayByPlay": "playbyplay",
+    }
+
+    def __init__(self, fixtures_dir=None, recorded_game_id=None, payloads=None):
+        self.fixtures_dir = fixtures_dir
+        self.recorded_game_id = recorded_game_id
+        self.payloads = payloads or {}
+        self.requests = []
+        self._raw_fixtures = {}
+        self._lock = threading.Lock()
+
+    def read_fixture(self, path):
+        with self._lock:
+            if path not in self._raw_fixtures:
+                with open(path, "r") as file:
+                    self._raw_fixtures[path] = file.read()
+            return self._raw_fixtures[path]
+
+    def get(self, endpoint_class, params):
+        name = endpoint_class.__name__
+        with self._lock:
+            self.requests.append((name, params))
+        if name in self.payloads:
+            payload = self.payloads[name]
+            return payload(**params) if callable(payload) else payload
+
+        if self.fixtures_dir is None:
+            raise LookupError(f"No recorded payload for {name}")
+        fixture_name = self.fixture_names.get(name, name.lower())
+        game_id = params.get("game_id")
+        game_path = os.path.join(self.fixtures_dir, f"{fixture_name}_{game_id}.json")
+        if game_id and os.path.exists(game_path):
+            return json.loads(self.read_fixture(game_path))
+
+        raw_payload = self.read_fixture(
+            os.path.join(self.fixtures_dir, f"{fixture_name}.json")
+        )
+        if game_id and self.recorded_game_id:
+            raw_payload = raw_payload.replace(self.recorded_game_id, game_id)
+        return json.loads(raw_payload)
+
+
+class FakeNBAServer:
+    """Serve recorded JSON on localhost in place of stats.nba.com / cdn.nba.com.
+
+    ``routes`` maps a URL path (query string ignored) to a payload, or to a
+    callable returning one so a test can change the response between polls.
+    ``connections`` collects the client addresses seen. Stats endpoints are
+    served under ``/stats/`` and live ones under ``/live/``; ``transport()``
+    returns an HTTPTransport pointed at them.
+    """
+
+    def __init__(self, routes=None):
+        self.routes = routes or {}
+        self.requests = []
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                server.requests.append(path)
+                server.connections.add(self.client_address)
+                payload = server.routes.get(path)
+                if callable(payload):
+                    payload = payload()
+                if payload is None:
+                    self.send_error(404)
+                    return
+
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def transport(self, **options):
+        return HTTPTransport(
+            base_urls={
+                "stats": f"{self.base_url}/stats/{{endpoint}}",
+                "live": f"{self.base_url}/live/{{endpoint}}",
+            },
+            **options,
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+transports = {
+    "http": HTTPTransport,
+    "nba_api": EndpointTransport,
+}
+
+
+def create_transport(name=NBA_API_TRANSPORT):
+    if name not in transports:
+        raise ValueError(
+            f"Unknown NBA API transport {name!r}, expected one of {tuple(transports)}"
+        )
+    return transports[name]()
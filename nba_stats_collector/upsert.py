@@ -0,0 +1,49 @@
+import logging
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+logger = logging.getLogger(__name__)
+
+dialect_inserts = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+conflict_modes = ("error", "update", "ignore")
+
+
+def build_insert(table, dialect_name, on_conflict="update"):
+    """Build an INSERT for the table that resolves primary key conflicts.
+
+    ``on_conflict`` is one of "error" (plain INSERT), "update" (overwrite the
+    non-key columns with the incoming row) or "ignore" (keep the stored row).
+    Dialects without an upsert fall back to a plain INSERT, so conflicting rows
+    fail and are reported like in "error" mode.
+    """
+    if on_conflict not in conflict_modes:
+        raise ValueError(
+            f"Unknown on_conflict mode {on_conflict!r}, expected one of {conflict_modes}"
+        )
+    if on_conflict == "error":
+        return insert(table)
+
+    insert_method = dialect_inserts.get(dialect_name)
+    if insert_method is None:
+        logger.warning(
+            f"Upserts are not supported for the {dialect_name} dialect, "
+            f"inserting into {table.name} without on_conflict={on_conflict!r}."
+        )
+        return insert(table)
+
+    statement = insert_method(table)
+    key_columns = [column.name for column in table.primary_key.columns]
+    update_columns = {
+        column.name: statement.excluded[column.name]
+        for column in table.columns
+        if not column.primary_key
+    }
+    if on_conflict == "ignore" or not update_columns:
+        return statement.on_conflict_do_nothing(index_elements=key_columns)
+    return statement.on_conflict_do_update(
+        index_elements=key_columns, set_=update_columns
+    )
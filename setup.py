@@ -21,4 +21,5 @@ setup(
     url="",
     license=license,
     packages=find_packages(exclude=("tests", "docs")),
+    extras_require={"parquet": ["pyarrow"]},
 )
@@ -0,0 +1,24 @@
+import pytest
+from nba_stats_collector import etl
+from nba_stats_collector.etl import NBAStatsETL
+from tests.fake_nba_api import FakeLivePlayByPlay, FakeNBAGames, replay_transport
+
+
+@pytest.fixture
+def nba_stats_etl(monkeypatch):
+    """An ETL on an in-memory SQLite database with a fake scoreboard."""
+    monkeypatch.setattr(etl, "NBAGames", FakeNBAGames)
+    monkeypatch.setattr(etl, "DATABASE_URL", "sqlite://")
+    return NBAStatsETL(-1, chunk_size=4, requests_per_second=0, retry_base_seconds=0)
+
+
+@pytest.fixture
+def recorded_etl(monkeypatch):
+    """An ETL on an in-memory SQLite database replaying the recorded game."""
+    monkeypatch.setattr(etl, "DATABASE_URL", "sqlite://")
+    return NBAStatsETL(-1, requests_per_second=0, transport=replay_transport())
+
+
+@pytest.fixture
+def live_playbyplay():
+    return FakeLivePlayByPlay()
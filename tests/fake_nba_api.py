@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+from nba_stats_collector.transport import FakeNBAServer, ReplayTransport
+
+fixtures_dir = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+recorded_game_id = "0022201130"
+
+
+def load_fixture(name, game_id=None):
+    """Load a recorded payload, optionally relabelled as another game."""
+    with open(os.path.join(fixtures_dir, name), "r") as file:
+        raw_payload = file.read()
+    if game_id:
+        raw_payload = raw_payload.replace(recorded_game_id, game_id)
+    return json.loads(raw_payload)
+
+
+def replay_transport(**payloads):
+    """Replay the recorded fixtures, relabelled as the requested game."""
+    return ReplayTransport(fixtures_dir, recorded_game_id, payloads)
+
+
+class FakeNBAGames:
+    def __init__(self, day_offset=0, game_date=None, transport=None):
+        self.day_offset = day_offset
+        self.game_date = game_date
+
+    def get_games_list(self):
+        return ["0022201130", "0022201131", "0022201132"]
+
+    def get_game_statuses(self):
+        return {game_id: 3 for game_id in self.get_games_list()}
+
+
+class FakeNBAPlayByPlay:
+    def __init__(self, game_id, game_status_id=None, transport=None):
+        self.game_id = game_id
+        self.game_status_id = game_status_id
+        self.fetch_thread = threading.get_ident()
+
+    def get_2pt(self):
+        return []
+
+    def get_3pt(self):
+        return []
+
+    def iter_actions(self):
+        yield "period", [
+            {"game_id": self.game_id, "actionNumber": 1, "actionType": "period"}
+        ]
+        yield "memo", [{"game_id": self.game_id, "actionNumber": 2}]
+
+
+class FakeLivePlayByPlay:
+    """Serve ``actions`` as the live play-by-play of every game; tests change
+    ``actions`` between fetches."""
+
+    def __init__(self, actions=None):
+        self.actions = list(actions or [])
+
+    def get_dict(self, game_id):
+        return {
+            "game": {
+                "gameId": game_id,
+                "actions": [dict(action) for action in self.actions],
+            }
+        }
+
+    def transport(self):
+        return ReplayTransport(payloads={"PlayByPlay": self.get_dict})
+
+
+def make_action(action_number, action_type="2pt", edited="2023-04-09T17:00:00Z"):
+    return {
+        "actionNumber": action_number,
+        "orderNumber": action_number * 10000,
+        "actionType": action_type,
+        "personId": 1630000,
+        "edited": edited,
+        "description": f"Action {action_number}",
+    }
+
+
+def make_team(team_id, name=None):
+    name = name or f"Team {team_id}"
+    return {
+        "id": team_id,
+        "full_name": name,
+        "abbreviation": name[-3:],
+        "nickname": name,
+        "city": "City",
+        "state": "State",
+        "year_founded": 1946,
+    }
+
+
+def make_scoreboard(game_date, game_ids):
+    """The recorded scoreboard rewritten as ``game_date`` with final games
+    ``game_ids``, every other result set left empty."""
+    payload = load_fixture("scoreboard.json")
+    game_header, *other_result_sets = payload["resultSets"]
+    headers = game_header["headers"]
+    template = game_header["rowSet"][0]
+    game_header["rowSet"] = []
+    for game_id in game_ids:
+        row = dict(zip(headers, template))
+        row.update(
+            GAME_DATE_EST=f"{game_date.isoformat()}T00:00:00",
+            GAME_ID=game_id,
+            GAME_STATUS_ID=3,
+        )
+        game_header["rowSet"].append([row[header] for header in headers])
+    for result_set in other_result_sets:
+        result_set["rowSet"] = []
+    return payload
@@ -0,0 +1,65 @@
+from datetime import date
+import pytest
+from nba_stats_collector import etl
+from nba_stats_collector.artifacts import ArtifactStore
+from nba_stats_collector.etl import NBAStatsETL
+from nba_stats_collector.models import TeamGameLog, TwoPoint
+from tests.fake_nba_api import replay_transport
+
+
+class OfflineTransport:
+    def get(self, endpoint_class, params):
+        raise AssertionError(f"Unexpected {endpoint_class.__name__} request")
+
+
+def test_load_tasks_read_fetched_artifacts(monkeypatch, tmp_path):
+    monkeypatch.setattr(etl, "DATABASE_URL", "sqlite://")
+    game_date = date(2023, 4, 9)
+    store = ArtifactStore(game_date, str(tmp_path))
+
+    fetcher = NBAStatsETL(
+        game_date=game_date, requests_per_second=0, transport=replay_transport()
+    )
+    games = fetcher.fetch_artifacts(store)
+    assert games == [
+        {"game_id": "0022201130", "game_status_id": 3},
+        {"game_id": "0022201131", "game_status_id": 2},
+    ]
+    assert (tmp_path / "2023-04-09" / "playbyplay" / "0022201131.json.gz").exists()
+
+    loader = NBAStatsETL(
+        game_date=game_date,
+        games_stats=store.scoreboard(),
+        requests_per_second=0,
+        transport=OfflineTransport(),
+    )
+    for keyword in loader.game_day_data_config:
+        loader.store_game_day_data(keyword)
+    loader.store_game_stats(store.game_client("boxscore", "0022201130"))
+    loader.store_playbyplay_actions(store.game_client("playbyplay", "0022201130"))
+    loader.finish_games_data(["0022201130"])
+
+    assert not loader.failed_rows
+    with loader.Session() as session:
+        assert session.query(TeamGameLog).count() == 2
+        assert session.query(TwoPoint).count() == 2
+
+
+def test_artifact_dir_must_be_absolute():
+    for artifact_dir in ["", "nba_api_artifacts"]:
+        with pytest.raises(ValueError, match="NBA_API_ARTIFACT_DIR"):
+            ArtifactStore(date(2023, 4, 9), artifact_dir)
+
+
+def test_remove_expired_keeps_recent_dates(tmp_path):
+    for game_date in [date(2023, 3, 31), date(2023, 4, 2), date(2023, 4, 8)]:
+        ArtifactStore(game_date, str(tmp_path)).save("scoreboard", "day", {})
+    (tmp_path / "notes").mkdir()
+
+    store = ArtifactStore(date(2023, 4, 9), str(tmp_path))
+    assert store.remove_expired(retention_days=7) == [date(2023, 3, 31)]
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == [
+        "2023-04-02",
+        "2023-04-08",
+        "notes",
+    ]
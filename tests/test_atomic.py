@@ -0,0 +1,29 @@
+import pytest
+from nba_stats_collector.atomic import atomic_path
+
+
+def test_atomic_path_replaces_file_once_written(tmp_path):
+    path = tmp_path / "payload.json"
+    path.write_text("old")
+
+    with atomic_path(str(path)) as temp_path:
+        with open(temp_path, "w") as file:
+            file.write("new")
+        assert path.read_text() == "old"
+
+    assert path.read_text() == "new"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["payload.json"]
+
+
+def test_atomic_path_removes_temp_file_on_error(tmp_path):
+    path = tmp_path / "payload.json"
+    path.write_text("old")
+
+    with pytest.raises(ValueError):
+        with atomic_path(str(path)) as temp_path:
+            with open(temp_path, "w") as file:
+                file.write("partial")
+            raise ValueError("Failed to serialize")
+
+    assert path.read_text() == "old"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["payload.json"]
@@ -0,0 +1,120 @@
+from datetime import date
+import pytest
+import requests
+from sqlalchemy import func
+from nba_stats_collector import etl
+from nba_stats_collector.backfill import SeasonBackfill
+from nba_stats_collector.models import BackfillCheckpoint, Period
+from tests.fake_nba_api import load_fixture, make_scoreboard, replay_transport
+
+games_by_date = {
+    date(2023, 4, 7): ["0022201201", "0022201202"],
+    date(2023, 4, 8): [],
+    date(2023, 4, 9): ["0022201211"],
+}
+
+
+@pytest.fixture
+def failing_game_ids():
+    """Games whose play-by-play requests fail."""
+    return set()
+
+
+@pytest.fixture
+def season_backfill(monkeypatch, tmp_path, failing_game_ids):
+    def scoreboard(game_date, **params):
+        game_date = date.fromisoformat(game_date)
+        return make_scoreboard(game_date, games_by_date[game_date])
+
+    def playbyplay(game_id, **params):
+        if game_id in failing_game_ids:
+            raise requests.ConnectionError(f"Failed to fetch {game_id}")
+        return load_fixture("playbyplay.json", game_id)
+
+    monkeypatch.setattr(etl, "DATABASE_URL", f"sqlite:///{tmp_path / 'nba.db'}")
+    return SeasonBackfill(
+        date(2023, 4, 7),
+        date(2023, 4, 9),
+        batch_days=2,
+        requests_per_second=0,
+        retry_base_seconds=0,
+        transport=replay_transport(Scoreboard=scoreboard, PlayByPlay=playbyplay),
+    )
+
+
+def fetched(season_backfill, endpoint_name, param):
+    return [
+        params[param]
+        for name, params in season_backfill.etl.transport.requests
+        if name == endpoint_name
+    ]
+
+
+def count_games(season_backfill, table_model):
+    with season_backfill.etl.Session() as session:
+        return session.query(func.count(table_model.game_id.distinct())).scalar()
+
+
+def count_rows(season_backfill, table_model, **filters):
+    with season_backfill.etl.Session() as session:
+        return session.query(table_model).filter_by(**filters).count()
+
+
+def test_backfill_loads_every_game(season_backfill):
+    season_backfill.run()
+    assert count_games(season_backfill, Period) == 3
+    assert count_rows(season_backfill, BackfillCheckpoint, stage="day_complete") == 3
+    assert sorted(fetched(season_backfill, "PlayByPlay", "game_id")) == [
+        "0022201201",
+        "0022201202",
+        "0022201211",
+    ]
+
+
+def test_backfill_resumes_from_checkpoints(season_backfill, failing_game_ids):
+    failing_game_ids.add("0022201202")
+    season_backfill.run()
+    assert season_backfill.etl.failed_fetches["NBAPlayByPlay"] == 1
+    assert count_games(season_backfill, Period) == 2
+    assert count_rows(season_backfill, BackfillCheckpoint, stage="day_complete") == 2
+
+    failing_game_ids.clear()
+    season_backfill.etl.transport.requests.clear()
+    season_backfill.run()
+
+    assert count_games(season_backfill, Period) == 3
+    assert count_rows(season_backfill, BackfillCheckpoint, stage="day_complete") == 3
+    assert fetched(season_backfill, "PlayByPlay", "game_id") == ["0022201202"]
+    assert "2023-04-08" not in fetched(season_backfill, "Scoreboard", "game_date")
+
+
+def test_backfill_only_checkpoints_games_whose_rows_landed(
+    season_backfill, monkeypatch
+):
+    insert_chunk = season_backfill.etl._insert_chunk
+    failing_rows = {"0022201202"}
+
+    def fail_rows(table, rows, on_conflict=None):
+        if table.name == "period" and rows[0]["game_id"] in failing_rows:
+            season_backfill.etl.failed_rows[table.name] += len(rows)
+            return 0
+        return insert_chunk(table, rows, on_conflict)
+
+    monkeypatch.setattr(season_backfill.etl, "_insert_chunk", fail_rows)
+    season_backfill.run()
+    assert count_games(season_backfill, Period) == 2
+    assert count_rows(season_backfill, BackfillCheckpoint, game_id="0022201202") == 1
+    assert count_rows(season_backfill, BackfillCheckpoint, stage="day_complete") == 2
+
+    failing_rows.clear()
+    season_backfill.run()
+    assert count_games(season_backfill, Period) == 3
+    assert count_rows(season_backfill, BackfillCheckpoint, stage="day_complete") == 3
+
+
+def test_for_season_covers_october_through_june(season_backfill):
+    season = SeasonBackfill.for_season("2021-22", requests_per_second=0)
+    assert (season.start_date, season.end_date) == (
+        date(2021, 10, 1),
+        date(2022, 6, 30),
+    )
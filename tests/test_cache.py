@@ -0,0 +1,89 @@
+import os
+import pytest
+from nba_stats_collector import cache, nba_api_client
+from nba_stats_collector.cache import ResponseCache
+from nba_stats_collector.transport import EndpointTransport
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    return ResponseCache(str(tmp_path), max_bytes=1100)
+
+
+def test_get_returns_cached_payload(response_cache):
+    response_cache.set("scoreboard", {"game_date": "2023-04-09"}, {"games": [1]})
+    assert response_cache.get("scoreboard", {"game_date": "2023-04-09"}) == {
+        "games": [1]
+    }
+    assert response_cache.get("scoreboard", {"game_date": "2023-04-10"}) is None
+
+
+def test_key_ignores_parameter_order():
+    assert ResponseCache.make_key("boxscore", {"a": 1, "b": 2}) == (
+        ResponseCache.make_key("boxscore", {"b": 2, "a": 1})
+    )
+
+
+def test_expired_entries_are_dropped(response_cache, monkeypatch):
+    response_cache.set("playbyplay", {"game_id": "1"}, {"actions": []}, ttl=15)
+    monkeypatch.setattr(cache.time, "time", lambda: 2**40)
+    assert response_cache.get("playbyplay", {"game_id": "1"}) is None
+    assert not os.listdir(response_cache.cache_dir)
+
+
+def test_zero_ttl_skips_caching(response_cache):
+    response_cache.set("playbyplay", {"game_id": "1"}, {"actions": []}, ttl=0)
+    assert response_cache.get("playbyplay", {"game_id": "1"}) is None
+
+
+def test_least_recently_used_entries_are_evicted(response_cache):
+    payload = {"data": "x" * 300}
+    for game_id in range(3):
+        response_cache.set("boxscore", {"game_id": game_id}, payload)
+        path = response_cache._path("boxscore", {"game_id": game_id})
+        os.utime(path, (game_id, game_id))
+
+    response_cache.get("boxscore", {"game_id": 0})
+    response_cache.set("boxscore", {"game_id": 3}, payload)
+    assert response_cache.get("boxscore", {"game_id": 1}) is None
+    assert response_cache.get("boxscore", {"game_id": 0}) == payload
+    assert response_cache.get("boxscore", {"game_id": 3}) == payload
+
+
+class CountingEndpoint:
+    calls = 0
+
+    def __init__(self, game_id):
+        self.game_id = game_id
+        CountingEndpoint.calls += 1
+
+    def get_dict(self):
+        return {"game": {"gameId": self.game_id, "actions": []}}
+
+
+def test_fetch_endpoint_serves_repeat_calls_from_cache(response_cache, monkeypatch):
+    monkeypatch.setattr(nba_api_client, "response_cache", response_cache)
+    for _ in range(2):
+        payload = nba_api_client.fetch_endpoint(
+            CountingEndpoint, None, EndpointTransport(), game_id="0022201130"
+        )
+    assert payload["game"]["gameId"] == "0022201130"
+    assert CountingEndpoint.calls == 1
+
+
+def test_status_ttl():
+    assert nba_api_client.status_ttl(nba_api_client.GAME_STATUS_FINAL) is None
+    assert nba_api_client.status_ttl(nba_api_client.GAME_STATUS_LIVE) == (
+        nba_api_client.NBA_API_CACHE_TTL_LIVE
+    )
+    assert nba_api_client.status_ttl(nba_api_client.GAME_STATUS_SCHEDULED) == (
+        nba_api_client.NBA_API_CACHE_TTL_SCHEDULED
+    )
+
+
+def test_playbyplay_ttl_caches_finished_games_forever():
+    ttl = nba_api_client.playbyplay_ttl(nba_api_client.GAME_STATUS_LIVE)
+    finished = {"game": {"actions": [{"actionType": "game", "subType": "end"}]}}
+    running = {"game": {"actions": [{"actionType": "2pt", "subType": "jumpshot"}]}}
+    assert ttl(finished) is None
+    assert ttl(running) == nba_api_client.NBA_API_CACHE_TTL_LIVE
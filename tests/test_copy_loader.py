@@ -0,0 +1,129 @@
+import csv
+import io
+import re
+import pytest
+from sqlalchemy import create_engine, insert, inspect, select
+from sqlalchemy.dialects import postgresql
+from nba_stats_collector.copy_loader import (
+    copy_rows,
+    dedupe_rows,
+    merge_statement,
+    rows_to_csv,
+    staging_table,
+)
+from nba_stats_collector.models import Team
+from tests.fake_nba_api import make_team
+
+
+def test_rows_to_csv_keeps_empty_strings_apart_from_nulls():
+    buffer = rows_to_csv(
+        [
+            {"id": 1, "name": 'Hawks "ATL"', "city": "", "founded": None},
+            {"id": 2, "name": "Celtics", "city": "Boston", "founded": 1946.0},
+        ],
+        ["id", "name", "city", "founded"],
+    )
+    assert buffer.read() == ('1,"Hawks ""ATL""","",\n' '2,"Celtics","Boston",1946.0\n')
+
+
+def test_dedupe_rows_keeps_last_row_per_key():
+    rows = [{"id": 1, "nickname": "Hawks"}, {"id": 1, "nickname": "Hawks 2"}]
+    assert dedupe_rows(rows, Team.__table__) == [{"id": 1, "nickname": "Hawks 2"}]
+
+
+def test_merge_statement_upserts_from_staging():
+    staging = staging_table(Team.__table__)
+    statement = str(
+        merge_statement(Team.__table__, staging, "update").compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "INSERT INTO teams" in statement
+    assert "FROM teams_staging" in statement
+    assert "ON CONFLICT (id) DO UPDATE" in statement
+
+
+class FakeCopyCursor:
+    """Wraps a SQLite cursor with psycopg2's ``copy_expert``, which records the
+    COPY and loads its CSV into the named table with plain inserts."""
+
+    def __init__(self, cursor, copies):
+        self.cursor = cursor
+        self.copies = copies
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+    def copy_expert(self, sql, buffer):
+        data = buffer.read()
+        self.copies.append((sql, data))
+        table_name, columns = re.match(r"COPY (\S+) \((.*)\) FROM STDIN", sql).groups()
+        rows = [
+            [value if value != "" else None for value in row]
+            for row in csv.reader(io.StringIO(data))
+        ]
+        placeholders = ", ".join("?" for _ in rows[0])
+        self.cursor.executemany(
+            f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})", rows
+        )
+
+
+@pytest.fixture
+def copy_connection(monkeypatch):
+    """A SQLite connection with a teams table whose DBAPI cursors can COPY;
+    the COPY statements run are collected in ``copy_connection.copies``."""
+    engine = create_engine("sqlite://")
+    Team.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Team.__table__), [make_team(1, "Old Hawks")])
+
+    with engine.begin() as connection:
+        cursor = connection.connection.cursor
+        connection.copies = []
+        monkeypatch.setattr(
+            connection.connection,
+            "cursor",
+            lambda *args: FakeCopyCursor(cursor(*args), connection.copies),
+        )
+        yield connection
+
+
+def team_names(connection):
+    return dict(connection.execute(select(Team.id, Team.full_name)).all())
+
+
+def test_copy_rows_upserts_through_staging_table(copy_connection):
+    rows = [make_team(1, "Hawks"), make_team(2), make_team(1, "Atlanta Hawks")]
+    assert copy_rows(copy_connection, Team.__table__, rows, "update") == 2
+
+    [(copy_sql, data)] = copy_connection.copies
+    assert copy_sql.startswith("COPY teams_staging (id, full_name, ")
+    assert "FROM STDIN WITH (FORMAT csv)" in copy_sql
+    assert data.splitlines()[0].startswith('1,"Atlanta Hawks",')
+    assert len(data.splitlines()) == 2
+    assert team_names(copy_connection) == {1: "Atlanta Hawks", 2: "Team 2"}
+
+
+def test_copy_rows_ignore_counts_only_inserted_rows(copy_connection):
+    rows = [make_team(1, "Hawks"), make_team(2)]
+    assert copy_rows(copy_connection, Team.__table__, rows, "ignore") == 1
+    assert team_names(copy_connection) == {1: "Old Hawks", 2: "Team 2"}
+
+
+def test_copy_rows_copies_straight_into_table_on_error_mode(copy_connection):
+    # Any duplicate key should fail the batch, so there is nothing to merge
+    rows = [make_team(2), make_team(3)]
+    assert copy_rows(copy_connection, Team.__table__, rows, "error") == 2
+
+    [(copy_sql, data)] = copy_connection.copies
+    assert copy_sql.startswith("COPY teams (id, full_name, ")
+    assert len(data.splitlines()) == 2
+    assert "teams_staging" not in inspect(copy_connection).get_temp_table_names()
+    assert len(team_names(copy_connection)) == 3
+
+
+def test_copy_write_mode_falls_back_to_inserts_on_sqlite(nba_stats_etl):
+    nba_stats_etl.write_mode = "copy"
+    rows = [make_team(team_id) for team_id in range(3)]
+    assert nba_stats_etl.commit_data(rows, Team) == 3
+    assert nba_stats_etl.commit_data(rows, Team) == 3
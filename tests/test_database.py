@@ -0,0 +1,26 @@
+from sqlalchemy import text
+from nba_stats_collector import database
+
+
+def test_get_engine_shares_file_engines_and_enables_wal(tmp_path):
+    url = f"sqlite:///{tmp_path / 'nba_stats.db'}"
+    engine = database.get_engine(url)
+    assert database.get_engine(url) is engine
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+    engine.dispose()
+
+
+def test_get_engine_keeps_in_memory_databases_apart():
+    assert database.get_engine("sqlite://") is not database.get_engine("sqlite://")
+
+
+def test_engine_options_for_postgresql(monkeypatch):
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 8)
+    monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 30000)
+    options = database.engine_options("postgresql://user:secret@db:5432/nba_stats")
+    assert options["pool_size"] == 8
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=30000"}
+    assert "pool_size" not in database.engine_options("sqlite:///nba_stats.db")
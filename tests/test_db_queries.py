@@ -0,0 +1,81 @@
+from datetime import datetime
+import pytest
+from nba_stats_collector.models import PlayerStatsByGame, Shot, TeamGameLog
+from webapp import db_queries
+
+
+@pytest.fixture
+def nba_stats_etl(nba_stats_etl, monkeypatch):
+    monkeypatch.setattr(db_queries, "engine", nba_stats_etl.engine)
+    monkeypatch.setattr(db_queries.query_cache, "engine", nba_stats_etl.engine)
+    db_queries.query_cache.clear()
+    yield nba_stats_etl
+    db_queries.query_cache.clear()
+
+
+def make_team_game(team_id, game_id, game_number):
+    return {
+        "team_id": team_id,
+        "game_id": game_id,
+        "game_date_est": datetime(2023, 4, game_number),
+        "home_or_away": "home",
+        "game_number": game_number,
+        "home_games_count": game_number,
+        "away_games_count": 0,
+    }
+
+
+def test_load_team_stats_per_game_binds_team_id(nba_stats_etl):
+    nba_stats_etl.commit_data(
+        [
+            make_team_game(1610612737, "0022201130", 2),
+            make_team_game(1610612737, "0022201120", 1),
+            make_team_game(1610612738, "0022201130", 1),
+        ],
+        TeamGameLog,
+    )
+
+    team_stats = db_queries.load_team_stats_per_game("1610612737")
+    assert team_stats["game_id"].tolist() == ["0022201120", "0022201130"]
+    assert len(db_queries.load_team_stats_per_game()) == 3
+    with pytest.raises(ValueError):
+        db_queries.load_team_stats_per_game("1 or 1=1")
+
+
+def test_load_shotchart_data_binds_player_id(nba_stats_etl):
+    nba_stats_etl.commit_data(
+        [
+            {
+                "game_id": "0022201130",
+                "player_id": 2544,
+                "team_id": 1610612747,
+                "player_name": "LeBron James",
+                "start_position": "F",
+                "comment": "",
+            }
+        ],
+        PlayerStatsByGame,
+    )
+    nba_stats_etl.commit_data(
+        [
+            {
+                "game_id": "0022201130",
+                "action_number": number,
+                "player_id": player_id,
+                "x": 10.0,
+                "y": 20.0,
+                "made": made,
+                "shot_type": "2pt",
+            }
+            for number, player_id, made in [
+                (1, 2544, True),
+                (2, 2544, False),
+                (3, 201939, True),
+            ]
+        ],
+        Shot,
+    )
+
+    shots = db_queries.load_shotchart_data(2544)
+    assert shots["SHOT_MADE_FLAG"].tolist() == ["Made", "Missed"]
+    assert set(shots["player_name"]) == {"LeBron James"}
@@ -0,0 +1,328 @@
+import threading
+from collections import Counter
+import pytest
+import requests
+from sqlalchemy import text
+from nba_stats_collector import etl, materialized
+from nba_stats_collector.etl import NBAStatsETL
+from nba_stats_collector.nba_api_client import NBAGameStats
+from nba_stats_collector.models import (
+    Team,
+    Period,
+    PlayByPlayEvent,
+    PlayByPlayWatermark,
+    Shot,
+    TeamGameLog,
+    TwoPoint,
+)
+from nba_stats_collector.transport import ReplayTransport
+from tests.fake_nba_api import (
+    FakeNBAGames,
+    FakeNBAPlayByPlay,
+    load_fixture,
+    make_action,
+    make_team,
+)
+
+
+def count_rows(nba_stats_etl, table_model):
+    with nba_stats_etl.Session() as session:
+        return session.query(table_model).count()
+
+
+def test_bulk_commit_data(nba_stats_etl):
+    teams = [make_team(team_id) for team_id in range(10)]
+    assert nba_stats_etl.commit_data(teams, Team) == 10
+    assert count_rows(nba_stats_etl, Team) == 10
+
+
+def test_bulk_commit_data_isolates_bad_rows(nba_stats_etl):
+    teams = [make_team(team_id) for team_id in range(10)]
+    teams[3]["full_name"] = None
+    teams[8]["full_name"] = None
+    assert nba_stats_etl.commit_data(teams, Team) == 8
+    assert nba_stats_etl.failed_rows["teams"] == 2
+    assert count_rows(nba_stats_etl, Team) == 8
+
+
+def test_orm_commit_data(nba_stats_etl):
+    nba_stats_etl.write_mode = "orm"
+    teams = [make_team(team_id) for team_id in range(3)]
+    teams.append(make_team(0))
+    assert nba_stats_etl.commit_data(teams, Team) == 3
+    assert nba_stats_etl.failed_rows["teams"] == 1
+
+
+def test_commit_data_coerces_api_values(nba_stats_etl):
+    action = {
+        "game_id": "0022201130",
+        "actionNumber": 1,
+        "actionType": "period",
+        "qualifiers": ["startperiod"],
+        "personIdsFilter": [],
+        "unknown_field": "ignored",
+    }
+    assert nba_stats_etl.commit_data([action], Period) == 1
+    with nba_stats_etl.Session() as session:
+        assert session.get(Period, ("0022201130", 1)).qualifiers == "startperiod"
+
+
+def test_bulk_commit_data_upserts_on_rerun(nba_stats_etl):
+    teams = [make_team(team_id) for team_id in range(3)]
+    nba_stats_etl.commit_data(teams, Team)
+    teams[1]["city"] = "New City"
+    assert nba_stats_etl.commit_data(teams, Team) == 3
+    assert not nba_stats_etl.failed_rows
+    with nba_stats_etl.Session() as session:
+        assert session.get(Team, 1).city == "New City"
+
+
+def test_bulk_commit_data_ignores_conflicts(nba_stats_etl):
+    nba_stats_etl.on_conflict = "ignore"
+    teams = [make_team(team_id) for team_id in range(3)]
+    nba_stats_etl.commit_data(teams, Team)
+    teams[1]["city"] = "New City"
+    nba_stats_etl.commit_data(teams, Team)
+    assert not nba_stats_etl.failed_rows
+    with nba_stats_etl.Session() as session:
+        assert session.get(Team, 1).city == "City"
+
+
+def test_bulk_commit_data_reports_conflicts(nba_stats_etl):
+    nba_stats_etl.on_conflict = "error"
+    teams = [make_team(team_id) for team_id in range(3)]
+    nba_stats_etl.commit_data(teams, Team)
+    assert nba_stats_etl.commit_data(teams, Team) == 0
+    assert nba_stats_etl.failed_rows["teams"] == 3
+
+
+def test_store_games_data_fetches_concurrently(nba_stats_etl, monkeypatch):
+    writer_threads = set()
+    commit_data = nba_stats_etl.commit_data
+
+    def record_writer(data_list, table_model, **options):
+        writer_threads.add(threading.get_ident())
+        return commit_data(data_list, table_model, **options)
+
+    monkeypatch.setattr(nba_stats_etl, "commit_data", record_writer)
+    clients = [(FakeNBAPlayByPlay, nba_stats_etl.store_playbyplay_actions)]
+    fetched = list(nba_stats_etl.fetch_games(clients))
+    assert sorted(client.game_id for client, _ in fetched) == [
+        "0022201130",
+        "0022201131",
+        "0022201132",
+    ]
+    assert all(client.fetch_thread != threading.get_ident() for client, _ in fetched)
+
+    nba_stats_etl.store_games_data(clients)
+    assert writer_threads == {threading.get_ident()}
+    assert count_rows(nba_stats_etl, Period) == 3
+
+
+def test_fetch_games_retries_and_skips_failed_games(nba_stats_etl):
+    attempts = Counter()
+
+    class FlakyNBAPlayByPlay(FakeNBAPlayByPlay):
+        def __init__(self, game_id, game_status_id=None, transport=None):
+            attempts[game_id] += 1
+            if attempts[game_id] == 1:
+                raise requests.Timeout(f"Timed out fetching {game_id}")
+            if game_id == "0022201132":
+                raise requests.ConnectionError(f"Failed to fetch {game_id}")
+            super().__init__(game_id, game_status_id)
+
+    clients = [(FlakyNBAPlayByPlay, nba_stats_etl.store_playbyplay_actions)]
+    nba_stats_etl.store_games_data(clients)
+
+    assert attempts == {"0022201130": 2, "0022201131": 2, "0022201132": 4}
+    assert nba_stats_etl.failed_fetches == {"FlakyNBAPlayByPlay": 1}
+    assert count_rows(nba_stats_etl, Period) == 2
+
+
+def test_commit_data_from_tuples(nba_stats_etl):
+    headers = ["id", "full_name", "abbreviation", "nickname", "city", "state"]
+    rows = [(1, "Team 1", "T01", "One", "City", "State")]
+    assert (
+        nba_stats_etl.commit_data(
+            (headers + ["year_founded"], [rows[0] + (1946,)]), Team
+        )
+        == 1
+    )
+    assert nba_stats_etl.commit_data((headers, rows), Team) == 0
+    assert nba_stats_etl.failed_rows["teams"] == 1
+
+
+def test_store_playbyplay_incremental(nba_stats_etl, monkeypatch, live_playbyplay):
+    nba_stats_etl.transport = live_playbyplay.transport()
+    written = []
+    commit_data = nba_stats_etl.commit_data
+
+    def record_rows(data_list, table_model, **options):
+        if table_model is not Shot:
+            written.extend(row["actionNumber"] for row in data_list)
+        return commit_data(data_list, table_model, **options)
+
+    monkeypatch.setattr(nba_stats_etl, "commit_data", record_rows)
+    game_ids = ["0022201130"]
+
+    live_playbyplay.actions = [make_action(1, "period"), make_action(2)]
+    nba_stats_etl.store_playbyplay_incremental(game_ids)
+    assert sorted(written) == [1, 2]
+
+    written.clear()
+    nba_stats_etl.store_playbyplay_incremental(game_ids)
+    assert written == []
+
+    edited_action = make_action(2, edited="2023-04-09T17:05:00Z")
+    edited_action["description"] = "Edited"
+    live_playbyplay.actions = [make_action(1, "period"), edited_action]
+    live_playbyplay.actions.append(make_action(3))
+    nba_stats_etl.store_playbyplay_incremental(game_ids)
+    assert sorted(written) == [2, 3]
+
+    with nba_stats_etl.Session() as session:
+        assert session.get(TwoPoint, ("0022201130", 2)).description == "Edited"
+        watermark = session.get(PlayByPlayWatermark, "0022201130")
+        assert (watermark.action_number, watermark.order_number) == (3, 30000)
+
+
+def test_store_playbyplay_incremental_upserts_whatever_the_settings(
+    nba_stats_etl, live_playbyplay
+):
+    nba_stats_etl.transport = live_playbyplay.transport()
+    nba_stats_etl.write_mode = "orm"
+    nba_stats_etl.on_conflict = "error"
+    game_ids = ["0022201130"]
+
+    live_playbyplay.actions = [make_action(1, "period"), make_action(2)]
+    nba_stats_etl.store_playbyplay_incremental(game_ids)
+    edited_action = make_action(2, edited="2023-04-09T17:05:00Z")
+    edited_action["description"] = "Edited"
+    live_playbyplay.actions = [make_action(1, "period"), edited_action]
+    nba_stats_etl.store_playbyplay_incremental(game_ids)
+
+    assert not nba_stats_etl.failed_rows
+    with nba_stats_etl.Session() as session:
+        assert session.get(TwoPoint, ("0022201130", 2)).description == "Edited"
+
+
+def test_store_playbyplay_incremental_keeps_watermark_on_failed_rows(
+    nba_stats_etl, monkeypatch, live_playbyplay
+):
+    nba_stats_etl.transport = live_playbyplay.transport()
+    insert_chunk = nba_stats_etl._insert_chunk
+    failing_tables = {"two_point"}
+
+    def fail_once(table, rows, on_conflict=None):
+        if table.name in failing_tables:
+            failing_tables.discard(table.name)
+            nba_stats_etl.failed_rows[table.name] += len(rows)
+            return 0
+        return insert_chunk(table, rows, on_conflict)
+
+    monkeypatch.setattr(nba_stats_etl, "_insert_chunk", fail_once)
+    game_ids = ["0022201130"]
+    live_playbyplay.actions = [make_action(1, "period"), make_action(2)]
+
+    nba_stats_etl.store_playbyplay_incremental(game_ids)
+    assert nba_stats_etl.get_playbyplay_watermarks(game_ids) == {}
+
+    nba_stats_etl.store_playbyplay_incremental(game_ids)
+    assert count_rows(nba_stats_etl, TwoPoint) == 1
+    assert nba_stats_etl.get_playbyplay_watermarks(game_ids).keys() == {"0022201130"}
+
+
+def test_store_playbyplay_incremental_skips_failed_games(
+    nba_stats_etl, live_playbyplay
+):
+    def playbyplay(game_id):
+        if game_id == "0022201131":
+            raise requests.ConnectionError(f"Failed to fetch {game_id}")
+        return live_playbyplay.get_dict(game_id)
+
+    nba_stats_etl.transport = ReplayTransport(payloads={"PlayByPlay": playbyplay})
+    live_playbyplay.actions = [make_action(1, "period"), make_action(2)]
+    nba_stats_etl.store_playbyplay_incremental(["0022201130", "0022201131"])
+
+    assert nba_stats_etl.failed_fetches == {"NBAPlayByPlay": 1}
+    assert nba_stats_etl.get_playbyplay_watermarks(
+        ["0022201130", "0022201131"]
+    ).keys() == {"0022201130"}
+
+
+def test_store_playbyplay_events(monkeypatch, live_playbyplay):
+    monkeypatch.setattr(etl, "NBAGames", FakeNBAGames)
+    monkeypatch.setattr(etl, "DATABASE_URL", "sqlite://")
+    live_playbyplay.actions = load_fixture("playbyplay.json")["game"]["actions"]
+    nba_stats_etl = NBAStatsETL(
+        -1,
+        requests_per_second=0,
+        pbp_storage="events",
+        transport=live_playbyplay.transport(),
+    )
+
+    nba_stats_etl.store_playbyplay_data()
+    assert count_rows(nba_stats_etl, PlayByPlayEvent) == 3 * 19
+    assert count_rows(nba_stats_etl, Shot) == 3 * 4
+    assert not nba_stats_etl.failed_rows
+    with nba_stats_etl.engine.connect() as connection:
+        shots = connection.execute(
+            text("select x, y, shotResult from two_point where game_id = :game_id"),
+            {"game_id": "0022201130"},
+        ).all()
+    assert sorted(shots) == [(5.2, 52.0, "Missed"), (12.5, 40.2, "Made")]
+
+
+def test_store_game_data_refreshes_team_game_log(recorded_etl):
+    for keyword in recorded_etl.game_day_data_config:
+        recorded_etl.store_game_day_data(keyword)
+    recorded_etl.store_single_game_data()
+    assert not recorded_etl.failed_rows
+
+    with recorded_etl.Session() as session:
+        game_log = session.query(TeamGameLog).order_by(TeamGameLog.team_id).all()
+    assert [(row.team_id, row.home_or_away) for row in game_log] == [
+        (1610612737, "home"),
+        (1610612738, "away"),
+    ]
+    assert game_log[0].game_number == 1
+    assert game_log[0].home_games_count == 1
+    assert game_log[0].pts_total_ot == 0
+    assert game_log[0].team_name == "ATL"
+
+
+def test_rebuild_shots_matches_etl_shots(nba_stats_etl, live_playbyplay):
+    nba_stats_etl.transport = live_playbyplay.transport()
+    live_playbyplay.actions = load_fixture("playbyplay.json")["game"]["actions"]
+    nba_stats_etl.store_playbyplay_data()
+    with nba_stats_etl.Session() as session:
+        etl_shots = [
+            (shot.game_id, shot.action_number, shot.made, shot.shot_type)
+            for shot in session.query(Shot).order_by(Shot.game_id, Shot.action_number)
+        ]
+
+    with nba_stats_etl.engine.begin() as connection:
+        assert materialized.rebuild_shots(connection) == 12
+    with nba_stats_etl.Session() as session:
+        rebuilt_shots = [
+            (shot.game_id, shot.action_number, shot.made, shot.shot_type)
+            for shot in session.query(Shot).order_by(Shot.game_id, Shot.action_number)
+        ]
+    assert rebuilt_shots == etl_shots
+    assert etl_shots[:2] == [
+        ("0022201130", 3, True, "2pt"),
+        ("0022201130", 4, False, "3pt"),
+    ]
+
+
+def test_finish_games_data_refreshes_games_stored_elsewhere(recorded_etl):
+    for keyword in recorded_etl.game_day_data_config:
+        recorded_etl.store_game_day_data(keyword)
+    recorded_etl.store_game_stats(
+        NBAGameStats("0022201130", transport=recorded_etl.transport)
+    )
+    recorded_etl._stale_team_ids.clear()
+
+    recorded_etl.finish_games_data(["0022201130"])
+    with recorded_etl.Session() as session:
+        assert session.query(TeamGameLog).count() == 2
@@ -0,0 +1,35 @@
+import pytest
+
+go = pytest.importorskip("plotly.graph_objs")
+from webapp import figure_generators  # noqa: E402
+from webapp.query_cache import QueryCache  # noqa: E402
+
+
+def test_cached_figure_rebuilds_after_new_data_version(nba_stats_etl, monkeypatch):
+    monkeypatch.setattr(
+        figure_generators,
+        "figure_cache",
+        QueryCache(
+            nba_stats_etl.engine,
+            version_source=QueryCache(nba_stats_etl.engine, version_check_seconds=0),
+        ),
+    )
+    calls = []
+
+    @figure_generators.cached_figure
+    def create_figure(team_id, stat):
+        calls.append((team_id, stat))
+        return go.Figure(layout={"title": {"text": f"{team_id} {stat}"}})
+
+    figure = create_figure(1610612737, "pts")
+    assert figure["layout"]["title"]["text"] == "1610612737 pts"
+    assert create_figure(1610612737, "pts") == figure
+    assert calls == [(1610612737, "pts")]
+
+    create_figure(1610612737, "ast")
+    assert len(calls) == 2
+
+    nba_stats_etl.stamp_data_version()
+    assert create_figure(1610612737, "pts") == figure
+    assert calls[-1] == (1610612737, "pts")
+    assert len(calls) == 3
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("dash")
+pytest.importorskip("dash_bootstrap_components")
+from webapp import layouts  # noqa: E402
+from webapp.layouts import DROPDOWN_OPTION_LIMIT, search_dropdown_options  # noqa: E402
+
+players = pd.DataFrame(
+    {
+        "id": [2544, 201939, 203507, 1629029],
+        "name": ["LeBron James", "Stephen Curry", "Giannis Antetokounmpo", None],
+    }
+)
+
+
+@pytest.fixture
+def player_id_map(monkeypatch):
+    monkeypatch.setitem(
+        layouts.dropdown_map,
+        "player",
+        {"load_id_map": lambda: players, "default": 2544},
+    )
+
+
+def option_ids(options):
+    return [option["value"] for option in options]
+
+
+def test_search_matches_the_start_of_any_word(player_id_map):
+    assert option_ids(search_dropdown_options("player", "jam")) == [2544]
+    assert option_ids(search_dropdown_options("player", "LEB")) == [2544]
+    assert option_ids(search_dropdown_options("player", "ames")) == []
+    assert option_ids(search_dropdown_options("player", "st")) == [201939]
+
+
+def test_search_keeps_the_selected_value_first(player_id_map):
+    assert search_dropdown_options("player", "curry", value="2544") == [
+        {"label": "LeBron James", "value": 2544},
+        {"label": "Stephen Curry", "value": 201939},
+    ]
+    # The selected value is not repeated when it matches the search too
+    assert option_ids(search_dropdown_options("player", "le", value=2544)) == [2544]
+
+
+def test_no_options_without_a_search(player_id_map):
+    assert search_dropdown_options("player") == []
+    assert option_ids(search_dropdown_options("player", "", value=203507)) == [203507]
+
+
+def test_search_is_capped_at_the_option_limit(monkeypatch):
+    many_players = pd.DataFrame(
+        {
+            "id": range(DROPDOWN_OPTION_LIMIT + 10),
+            "name": [
+                f"Player {number}" for number in range(DROPDOWN_OPTION_LIMIT + 10)
+            ],
+        }
+    )
+    monkeypatch.setitem(
+        layouts.dropdown_map,
+        "player",
+        {"load_id_map": lambda: many_players, "default": 0},
+    )
+    options = search_dropdown_options(
+        "player", "player", value=DROPDOWN_OPTION_LIMIT + 5
+    )
+    assert len(options) == DROPDOWN_OPTION_LIMIT + 1
+    assert options[0]["value"] == DROPDOWN_OPTION_LIMIT + 5
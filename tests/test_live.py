@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+from nba_stats_collector import etl, nba_api_client
+from nba_stats_collector.cache import ResponseCache
+from nba_stats_collector.etl import NBAStatsETL
+from nba_stats_collector.live import LiveGamePoller
+from nba_stats_collector.models import PlayByPlayWatermark, TwoPoint
+from tests.fake_nba_api import FakeNBAServer, load_fixture
+
+live_game_id = "0022201131"
+playbyplay_path = f"/live/playbyplay/playbyplay_{live_game_id}.json"
+
+
+def recorded_playbyplay(action_counts):
+    """Replay the recorded game, revealing ``action_counts[i]`` actions on poll i."""
+    payload = load_fixture("playbyplay.json")
+    payload["game"]["gameId"] = live_game_id
+    actions = payload["game"]["actions"]
+    polls = iter(action_counts)
+
+    def respond():
+        count = next(polls, len(actions))
+        return {**payload, "game": {**payload["game"], "actions": actions[:count]}}
+
+    return respond
+
+
+@pytest.fixture
+def fake_nba_server():
+    routes = {"/stats/scoreboard": load_fixture("scoreboard.json")}
+    with FakeNBAServer(routes) as server:
+        yield server
+
+
+@pytest.fixture
+def poller(fake_nba_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(etl, "DATABASE_URL", f"sqlite:///{tmp_path / 'nba.db'}")
+    nba_stats_etl = NBAStatsETL(
+        0, requests_per_second=0, transport=fake_nba_server.transport()
+    )
+    return LiveGamePoller(
+        nba_stats_etl, min_interval=0.01, max_interval=0.04, scoreboard_interval=0.01
+    )
+
+
+def test_poller_follows_live_game_until_final(fake_nba_server, poller):
+    fake_nba_server.routes[playbyplay_path] = recorded_playbyplay([5, 5, 12])
+    asyncio.run(poller.run())
+
+    assert poller.finished == {live_game_id}
+    assert fake_nba_server.requests.count(playbyplay_path) == 4
+    with poller.etl.Session() as session:
+        assert session.query(TwoPoint).filter_by(game_id=live_game_id).count() == 2
+        watermark = session.get(PlayByPlayWatermark, live_game_id)
+        assert watermark.action_number == 19
+
+
+def test_poller_backs_off_while_game_is_quiet(fake_nba_server, poller, monkeypatch):
+    fake_nba_server.routes[playbyplay_path] = recorded_playbyplay([5, 5, 5])
+    intervals = []
+    original_sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        intervals.append(delay)
+        await original_sleep(0)
+
+    poller.scoreboard_interval = 1.0
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+    asyncio.run(poller.run())
+
+    assert [delay for delay in intervals if delay != 1.0] == [0.01, 0.02, 0.04]
+
+
+def test_poller_survives_scoreboard_failures(fake_nba_server, poller):
+    scoreboard = fake_nba_server.routes["/stats/scoreboard"]
+    responses = iter([None])
+    fake_nba_server.routes["/stats/scoreboard"] = lambda: next(responses, scoreboard)
+    fake_nba_server.routes[playbyplay_path] = recorded_playbyplay([12])
+    asyncio.run(poller.run())
+
+    assert poller.finished == {live_game_id}
+    assert fake_nba_server.requests.count("/stats/scoreboard") >= 2
+
+
+def test_poller_bypasses_response_cache(fake_nba_server, poller, monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        nba_api_client, "response_cache", ResponseCache(str(tmp_path), max_bytes=10**7)
+    )
+    fake_nba_server.routes[playbyplay_path] = recorded_playbyplay([5, 5, 12])
+    asyncio.run(poller.run())
+
+    assert poller.finished == {live_game_id}
+    assert fake_nba_server.requests.count(playbyplay_path) == 4
+
+
+def test_poller_refetches_rows_that_failed(fake_nba_server, poller, monkeypatch):
+    fake_nba_server.routes[playbyplay_path] = recorded_playbyplay([12])
+    insert_chunk = poller.etl._insert_chunk
+    failing_tables = {"two_point"}
+
+    def fail_once(table, rows, on_conflict=None):
+        if table.name in failing_tables:
+            failing_tables.discard(table.name)
+            raise ValueError("Failed to insert")
+        return insert_chunk(table, rows, on_conflict)
+
+    monkeypatch.setattr(poller.etl, "_insert_chunk", fail_once)
+    asyncio.run(poller.run())
+
+    assert poller.finished == {live_game_id}
+    assert fake_nba_server.requests.count(playbyplay_path) == 2
+    with poller.etl.Session() as session:
+        assert session.query(TwoPoint).filter_by(game_id=live_game_id).count() == 2
+
+
+def test_poller_stops_when_scoreboard_reports_final(fake_nba_server, poller):
+    live_scoreboard = fake_nba_server.routes["/stats/scoreboard"]
+    final_scoreboard = load_fixture("scoreboard.json")
+    for row in final_scoreboard["resultSets"][0]["rowSet"]:
+        row[3] = 3
+    responses = iter([live_scoreboard])
+    fake_nba_server.routes["/stats/scoreboard"] = lambda: next(
+        responses, final_scoreboard
+    )
+    # The play-by-play never reaches the end of the game
+    fake_nba_server.routes[playbyplay_path] = recorded_playbyplay([5] * 1000)
+    asyncio.run(poller.run())
+
+    assert poller.finished == {live_game_id}
+
+
+def test_poller_gives_up_after_repeated_failures(fake_nba_server, poller):
+    poller.max_failures = 3
+    asyncio.run(poller.run())
+
+    assert poller.failed == {live_game_id}
+    assert not poller.finished
+    assert fake_nba_server.requests.count(playbyplay_path) == 3
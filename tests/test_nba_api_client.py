@@ -3,6 +3,7 @@ from nba_stats_collector.nba_api_client import (
     NBAGames,
     NBAGameStats,
     NBAPlayByPlay,
+    StatsEndpoints,
     get_team_data,
 )
 
@@ -49,3 +50,69 @@ def test_get_play_by_play(nba_play_by_play):
 def test_get_team_data():
     result = get_team_data()
     assert isinstance(result, list)
+
+
+@pytest.fixture
+def offline_play_by_play(live_playbyplay):
+    live_playbyplay.actions = [
+        {"actionNumber": 1, "actionType": "period"},
+        {"actionNumber": 2, "actionType": "2pt"},
+        {"actionNumber": 3, "actionType": "foul"},
+        {"actionNumber": 4, "actionType": "2pt"},
+    ]
+    return NBAPlayByPlay("0022201130", transport=live_playbyplay.transport())
+
+
+def test_play_by_play_buckets_actions(offline_play_by_play):
+    assert [play["actionNumber"] for play in offline_play_by_play.get_2pt()] == [2, 4]
+    assert [play["actionNumber"] for play in offline_play_by_play.get_foul()] == [3]
+    assert offline_play_by_play.get_block() == []
+    assert all(
+        play["game_id"] == "0022201130"
+        for play in offline_play_by_play.get_play_by_play()
+    )
+
+
+def test_iter_actions(offline_play_by_play):
+    buckets = dict(offline_play_by_play.iter_actions())
+    assert sorted(buckets) == ["2pt", "foul", "period"]
+    assert len(buckets["2pt"]) == 2
+
+
+class FakeStatsEndpoint(StatsEndpoints):
+    endpoint_result_dict = [
+        {
+            "headers": ["GAME_ID", "TEAM_ID", "PTS"],
+            "rowSet": [["0022201130", 1610612737, 110], ["0022201130", 1610612738, 98]],
+        },
+        {"headers": ["GAME_ID"], "rowSet": []},
+    ]
+
+
+@pytest.mark.parametrize(
+    "orient, expected",
+    [
+        ("records", [{"game_id": "0022201130", "team_id": 1610612737, "pts": 110}]),
+        ("columns", {"game_id": ["0022201130"], "team_id": [1610612737], "pts": [110]}),
+        ("tuples", (["game_id", "team_id", "pts"], [("0022201130", 1610612737, 110)])),
+    ],
+)
+def test_process_endpoint_data_orients(orient, expected):
+    endpoint = FakeStatsEndpoint()
+    endpoint.endpoint_result_dict = [
+        {
+            "headers": ["GAME_ID", "TEAM_ID", "PTS"],
+            "rowSet": [["0022201130", 1610612737, 110]],
+        }
+    ]
+    assert endpoint.process_endpoint_data(0, orient) == expected
+
+
+def test_process_endpoint_data_frame():
+    frame = FakeStatsEndpoint().process_endpoint_data(0, "frame")
+    assert list(frame.columns) == ["game_id", "team_id", "pts"]
+    assert frame["pts"].tolist() == [110, 98]
+
+
+def test_process_endpoint_data_empty_columns():
+    assert FakeStatsEndpoint().process_endpoint_data(1, "columns") == {"game_id": []}
@@ -0,0 +1,63 @@
+from datetime import date
+import pytest
+from nba_stats_collector.models import GameHeaders, PlayerStatsByGame, Team
+from nba_stats_collector.parquet_export import (
+    partition_date_column,
+    partitioned_rows,
+    season_for_date,
+)
+
+
+def load_recorded_game(recorded_etl):
+    for keyword in recorded_etl.game_day_data_config:
+        recorded_etl.store_game_day_data(keyword)
+    recorded_etl.store_single_game_data()
+
+
+def test_season_for_date():
+    assert season_for_date(date(2022, 10, 18)) == "2022-23"
+    assert season_for_date(date(2023, 4, 9)) == "2022-23"
+    assert season_for_date(date(1999, 12, 31)) == "1999-00"
+
+
+def test_partition_date_column():
+    assert partition_date_column(GameHeaders.__table__).table is GameHeaders.__table__
+    assert (
+        partition_date_column(PlayerStatsByGame.__table__).table
+        is GameHeaders.__table__
+    )
+    assert partition_date_column(Team.__table__) is None
+
+
+def test_partitioned_rows_dates_games_through_game_headers(recorded_etl):
+    load_recorded_game(recorded_etl)
+    game_date = date(2023, 4, 9)
+    with recorded_etl.engine.connect() as connection:
+        headers = partitioned_rows(connection, GameHeaders.__table__, [game_date])
+        player_stats = partitioned_rows(
+            connection, PlayerStatsByGame.__table__, [game_date, date(2023, 4, 10)]
+        )
+
+    assert len(headers[game_date]) == 2
+    assert player_stats[game_date]
+    assert set(player_stats[game_date][0]) == set(
+        PlayerStatsByGame.__table__.columns.keys()
+    )
+    assert player_stats[date(2023, 4, 10)] == []
+
+
+def test_export_parquet_writes_loaded_game_dates(recorded_etl, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    recorded_etl.parquet_export_dir = str(tmp_path)
+    load_recorded_game(recorded_etl)
+
+    partition = (
+        tmp_path
+        / "player_stats_by_game"
+        / "season=2022-23"
+        / "game_date=2023-04-09"
+        / "part-0.parquet"
+    )
+    table = pq.read_table(partition, memory_map=True)
+    assert table.num_rows > 0
+    assert table.schema.field("player_id").type == "int64"
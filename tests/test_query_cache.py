@@ -0,0 +1,80 @@
+from webapp.query_cache import QueryCache
+
+
+def make_counting_query(query_cache, calls):
+    @query_cache.cached
+    def load_rows(team_id=None):
+        calls.append(team_id)
+        return [team_id, len(calls)]
+
+    return load_rows
+
+
+def test_query_cache_invalidated_by_data_version(nba_stats_etl):
+    calls = []
+    query_cache = QueryCache(nba_stats_etl.engine, version_check_seconds=0)
+    load_rows = make_counting_query(query_cache, calls)
+
+    assert load_rows(1) == [1, 1]
+    assert load_rows(1) == [1, 1]
+    assert load_rows(2) == [2, 2]
+    assert calls == [1, 2]
+
+    nba_stats_etl.stamp_data_version()
+    assert query_cache.data_version() == 1
+    assert load_rows(1) == [1, 3]
+
+    nba_stats_etl.stamp_data_version()
+    assert query_cache.data_version() == 2
+
+
+def test_query_cache_evicts_least_recently_used(nba_stats_etl):
+    calls = []
+    query_cache = QueryCache(nba_stats_etl.engine, max_entries=2)
+    load_rows = make_counting_query(query_cache, calls)
+
+    load_rows(1)
+    load_rows(2)
+    load_rows(1)
+    load_rows(3)
+    load_rows(1)
+    load_rows(2)
+    assert calls == [1, 2, 3, 2]
+
+
+def test_query_cache_disk_tier_shared_between_instances(nba_stats_etl, tmp_path):
+    calls = []
+    first = make_counting_query(
+        QueryCache(nba_stats_etl.engine, cache_dir=str(tmp_path)), calls
+    )
+    second = make_counting_query(
+        QueryCache(nba_stats_etl.engine, cache_dir=str(tmp_path)), calls
+    )
+
+    assert first(1) == [1, 1]
+    assert second(1) == [1, 1]
+    assert calls == [1]
+
+    nba_stats_etl.stamp_data_version()
+    third = QueryCache(nba_stats_etl.engine, cache_dir=str(tmp_path))
+    third.data_version()
+    assert not list(tmp_path.iterdir())
+
+
+def test_query_cache_follows_version_source(nba_stats_etl):
+    calls = []
+    source = QueryCache(nba_stats_etl.engine, version_check_seconds=3600)
+    query_cache = QueryCache(
+        nba_stats_etl.engine, version_check_seconds=0, version_source=source
+    )
+    load_rows = make_counting_query(query_cache, calls)
+
+    assert load_rows(1) == [1, 1]
+    nba_stats_etl.stamp_data_version()
+    # The source has not seen the new version yet, so neither has the cache
+    assert query_cache.data_version() == 0
+    assert load_rows(1) == [1, 1]
+
+    source.clear()
+    assert query_cache.data_version() == 1
+    assert load_rows(1) == [1, 2]
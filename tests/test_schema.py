@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine, inspect
+from nba_stats_collector.models import Base, PlayerStatsByGame
+from nba_stats_collector.schema import create_missing_indexes, create_schema
+
+
+def test_create_missing_indexes_upgrades_existing_database():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.drop(engine)
+
+    assert create_missing_indexes(engine) == sum(
+        len(table.indexes) for table in Base.metadata.sorted_tables
+    )
+    index_names = {
+        index["name"] for index in inspect(engine).get_indexes("player_stats_by_game")
+    }
+    assert {index.name for index in PlayerStatsByGame.__table__.indexes} <= index_names
+    assert create_missing_indexes(engine) == 0
+
+
+def test_create_schema_with_events_storage_creates_views():
+    engine = create_engine("sqlite://")
+    create_schema(engine, "events")
+    inspector = inspect(engine)
+    assert "pbp_events" in inspector.get_table_names()
+    assert "two_point" not in inspector.get_table_names()
+    assert "two_point" in inspector.get_view_names()
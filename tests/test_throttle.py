@@ -0,0 +1,68 @@
+import time
+import requests
+from nba_stats_collector.throttle import (
+    CircuitBreaker,
+    RateLimiter,
+    RetryPolicy,
+    is_retryable,
+    shared_rate_limiter,
+)
+
+
+def test_rate_limiter_allows_bursts_then_spaces_calls(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    rate_limiter = RateLimiter(10, burst=3)
+    for _ in range(5):
+        rate_limiter.wait()
+    assert len(sleeps) == 2
+    assert 0.05 < sleeps[0] <= 0.1
+    assert 0.15 < sleeps[1] <= 0.2
+
+
+def test_shared_rate_limiter_is_one_bucket_per_rate():
+    assert shared_rate_limiter(2.0) is shared_rate_limiter(2.0)
+    assert shared_rate_limiter(2.0) is not shared_rate_limiter(4.0)
+
+
+def test_circuit_breaker_opens_on_error_rate():
+    circuit_breaker = CircuitBreaker(window=4, error_rate=0.5, cooldown=0.05)
+    for success in [True, False, True]:
+        circuit_breaker.record(success)
+    assert not circuit_breaker.is_open
+    circuit_breaker.record(False)
+    assert circuit_breaker.is_open
+
+    start = time.monotonic()
+    circuit_breaker.wait()
+    assert time.monotonic() - start >= 0.04
+    # The first result after the pause decides whether it opens again
+    circuit_breaker.record(False)
+    assert circuit_breaker.is_open
+    circuit_breaker.wait()
+    circuit_breaker.record(True)
+    circuit_breaker.record(False)
+    assert not circuit_breaker.is_open
+
+
+def test_retry_policy_delays_are_jittered_and_capped():
+    retry_policy = RetryPolicy(max_retries=5, base_delay=1.0, max_delay=4.0)
+    delays = [retry_policy.delay(attempt) for attempt in range(5) for _ in range(20)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def make_http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(response=response)
+
+
+def test_is_retryable():
+    assert is_retryable(requests.ConnectionError())
+    assert is_retryable(requests.Timeout())
+    assert is_retryable(make_http_error(429))
+    assert is_retryable(make_http_error(503))
+    assert not is_retryable(make_http_error(404))
+    assert not is_retryable(KeyError("resultSets"))
+    assert not is_retryable(requests.JSONDecodeError("Expecting value", "<html>", 0))
@@ -0,0 +1,61 @@
+import pytest
+from nba_api.live.nba.endpoints import playbyplay
+from nba_api.stats.endpoints import boxscoretraditionalv2, scoreboard
+from nba_stats_collector.nba_api_client import NBAGames, NBAPlayByPlay
+from nba_stats_collector.transport import (
+    FakeNBAServer,
+    HTTPTransport,
+    create_transport,
+)
+from tests.fake_nba_api import load_fixture, replay_transport
+
+
+def test_http_transport_builds_nba_api_requests():
+    transport = HTTPTransport()
+    url, parameters, _ = transport.request(
+        boxscoretraditionalv2.BoxScoreTraditionalV2, {"game_id": "0022201130"}
+    )
+    assert url == "https://stats.nba.com/stats/boxscoretraditionalv2"
+    assert ("GameID", "0022201130") in parameters
+    assert parameters == sorted(parameters)
+
+    url, parameters, _ = transport.request(
+        playbyplay.PlayByPlay, {"game_id": "0022201130"}
+    )
+    assert url.endswith("/playbyplay/playbyplay_0022201130.json")
+    assert parameters == []
+
+
+def test_http_transport_reuses_connections():
+    routes = {
+        "/stats/scoreboard": load_fixture("scoreboard.json"),
+        "/live/playbyplay/playbyplay_0022201130.json": load_fixture("playbyplay.json"),
+    }
+    with FakeNBAServer(routes) as server:
+        transport = server.transport()
+        games = NBAGames(transport=transport)
+        for _ in range(3):
+            NBAPlayByPlay("0022201130", transport=transport)
+        transport.close()
+
+    assert games.get_games_list() == ["0022201130", "0022201131"]
+    assert len(server.requests) == 4
+    assert len(server.connections) == 1
+
+
+def test_replay_transport_relabels_shared_fixtures():
+    transport = replay_transport()
+    payload = transport.get(playbyplay.PlayByPlay, {"game_id": "0022201199"})
+    assert payload["game"]["gameId"] == "0022201199"
+    assert transport.get(scoreboard.Scoreboard, {}) == load_fixture("scoreboard.json")
+    assert [name for name, _ in transport.requests] == ["PlayByPlay", "Scoreboard"]
+
+
+def test_replay_transport_prefers_given_payloads():
+    transport = replay_transport(PlayByPlay=lambda game_id: {"game_id": game_id})
+    assert transport.get(playbyplay.PlayByPlay, {"game_id": "1"}) == {"game_id": "1"}
+
+
+def test_create_transport_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        create_transport("carrier-pigeon")
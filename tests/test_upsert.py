@@ -0,0 +1,25 @@
+import logging
+import pytest
+from sqlalchemy.dialects import postgresql
+from nba_stats_collector.models import Team
+from nba_stats_collector.upsert import build_insert
+
+
+def test_build_insert_upserts_on_postgresql():
+    statement = build_insert(Team.__table__, "postgresql", "update")
+    assert "ON CONFLICT (id) DO UPDATE" in str(
+        statement.compile(dialect=postgresql.dialect())
+    )
+
+
+def test_build_insert_falls_back_to_plain_insert(caplog):
+    with caplog.at_level(logging.WARNING):
+        statement = build_insert(Team.__table__, "mysql", "update")
+    assert str(statement).startswith("INSERT INTO teams")
+    assert "ON CONFLICT" not in str(statement)
+    assert "Upserts are not supported for the mysql dialect" in caplog.text
+
+
+def test_build_insert_rejects_unknown_modes():
+    with pytest.raises(ValueError):
+        build_insert(Team.__table__, "sqlite", "merge")
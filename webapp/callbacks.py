@@ -1,6 +1,7 @@
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 
 from webapp.figure_generators import create_shot_chart_figure, create_team_stat_figure
+from webapp.layouts import search_dropdown_options
 
 
 class AppCallbacks:
@@ -29,6 +30,9 @@ class AppCallbacks:
     def _register_subtab_callbacks(self, subtab_config):
         subtab_id = subtab_config["tab_name"].lower().replace(" ", "_")
 
+        for dropdown in subtab_config["dropdowns"]:
+            self.dropdown_options_callback(subtab_id, dropdown)
+
         for graph_name in subtab_config["graphs"]:
             graph_id = f"{subtab_id}_{graph_name}"
             match graph_name:
@@ -45,6 +49,17 @@ class AppCallbacks:
                         subtab_id, graph_id, subtab_config["dropdowns"]
                     )
 
+    def dropdown_options_callback(self, tab_id, dropdown):
+        dropdown_id = f"{tab_id}_{dropdown}-dropdown"
+
+        @self.app.callback(
+            Output(dropdown_id, "options"),
+            Input(dropdown_id, "search_value"),
+            State(dropdown_id, "value"),
+        )
+        def _update_dropdown_options(search_value, value):
+            return search_dropdown_options(dropdown, search_value, value)
+
     def shot_chart_callback(self, tab_id, graph_id, dropdowns):
         @self.app.callback(
             Output(graph_id, "figure"),
@@ -5,11 +5,40 @@ import dash_bootstrap_components as dbc
 from dash import html, dcc
 from webapp.db_queries import load_player_id_map, load_team_id_map
 
+# Id maps are loaded on first search and cached by the query cache
 dropdown_map = {
-    "player": {"id_map": load_player_id_map(), "default": 2544},
-    "team": {"id_map": load_team_id_map(), "default": "1610612737"},
+    "player": {"load_id_map": load_player_id_map, "default": 2544},
+    "team": {"load_id_map": load_team_id_map, "default": "1610612737"},
 }
 
+# Most options sent to the browser for one search
+DROPDOWN_OPTION_LIMIT = 50
+
+
+def search_dropdown_options(name, search_value=None, value=None):
+    """Return the options matching a typed prefix, plus the selected value.
+
+    A prefix matches the start of any word in the name, so "jam" finds
+    "LeBron James".
+    """
+    id_map = dropdown_map[name]["load_id_map"]()
+    selected = id_map["id"].astype(str) == str(value)
+    if search_value:
+        prefix = search_value.lower()
+        names = id_map["name"].fillna("").str.lower()
+        matches = names.str.startswith(prefix) | names.str.contains(
+            f" {prefix}", regex=False
+        )
+        matches = id_map[matches & ~selected].head(DROPDOWN_OPTION_LIMIT)
+    else:
+        matches = id_map.iloc[0:0]
+
+    return [
+        {"label": label, "value": id}
+        for frame in (id_map[selected].head(1), matches)
+        for id, label in zip(frame["id"].tolist(), frame["name"].tolist())
+    ]
+
 
 class AppLayouts:
     def __init__(self, config_path):
@@ -56,7 +85,6 @@ class Tab:
             dbc.Col(
                 Dropdown(
                     self._generate_dropdown_id(name),
-                    dropdown_map[name]["id_map"],
                     dropdown_map[name]["default"],
                 ).create()
             )
@@ -98,7 +126,6 @@ class SubTab:
             dbc.Col(
                 Dropdown(
                     self._generate_dropdown_id(name),
-                    dropdown_map[name]["id_map"],
                     dropdown_map[name]["default"],
                 ).create()
             )
@@ -118,19 +145,18 @@ class SubTab:
 
 
 class Dropdown:
-    def __init__(self, dropdown_id, id_map, default=None):
+    def __init__(self, dropdown_id, default=None):
         self.dropdown_id = dropdown_id
-        self.id_map = id_map
         self.default = default
 
     def create(self):
+        # Options are filled in by the search callback, see
+        # AppCallbacks.dropdown_options_callback
         return dcc.Dropdown(
             id=self.dropdown_id,
-            options=[
-                {"label": name, "value": id}
-                for id, name in zip(self.id_map["id"], self.id_map["name"])
-            ],
+            options=[],
             value=self.default,
+            placeholder="Type to search...",
         )
 
 
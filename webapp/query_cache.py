@@ -0,0 +1,145 @@
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import select
+from nba_stats_collector.atomic import atomic_path
+from nba_stats_collector.config import (
+    QUERY_CACHE_DIR,
+    QUERY_CACHE_MAX_ENTRIES,
+    QUERY_CACHE_VERSION_CHECK_SECONDS,
+)
+from nba_stats_collector.models import DataVersion
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """Memoize query results until the ETL stamps a new data version.
+
+    Results live in an in-process LRU of ``max_entries`` and, when
+    ``cache_dir`` is set, in pickle files shared across workers. Keys include
+    the current ``data_version`` stamp, which is re-read at most every
+    ``version_check_seconds``, so a finished load invalidates every entry.
+    With ``version_source``, another QueryCache's version is used instead, so
+    results built from that cache's entries are keyed on the same stamp.
+    Cached frames are shared between callers and must not be modified.
+    """
+
+    def __init__(
+        self,
+        engine,
+        max_entries=QUERY_CACHE_MAX_ENTRIES,
+        cache_dir=QUERY_CACHE_DIR,
+        version_check_seconds=QUERY_CACHE_VERSION_CHECK_SECONDS,
+        version_source=None,
+    ):
+        self.engine = engine
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.version_check_seconds = version_check_seconds
+        self.version_source = version_source
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked_at = None
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def data_version(self):
+        now = time.monotonic()
+        if self.version_source is not None:
+            version = self.version_source.data_version()
+        elif (
+            self._version_checked_at is not None
+            and now - self._version_checked_at < self.version_check_seconds
+        ):
+            return self._version
+        else:
+            version = self._read_version()
+
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._remove_stale_files(version)
+            self._version = version
+            self._version_checked_at = now
+        return version
+
+    def _read_version(self):
+        statement = select(DataVersion.version).where(DataVersion.id == 1)
+        try:
+            with self.engine.connect() as connection:
+                return connection.execute(statement).scalar() or 0
+        except Exception as e:
+            logger.warning(f"Could not read the data version: {e}")
+            return 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version_checked_at = None
+
+    def cached(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            version = self.data_version()
+            key = (version, func.__name__, args, tuple(sorted(kwargs.items())))
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+
+            result = self._load_file(version, key)
+            if result is None:
+                result = func(*args, **kwargs)
+                self._store_file(version, key, result)
+            self._store(key, result)
+            return result
+
+        return wrapper
+
+    def _store(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, version, key):
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{version}-{digest}.pkl")
+
+    def _load_file(self, version, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(version, key), "rb") as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _store_file(self, version, key, result):
+        if not self.cache_dir:
+            return
+        path = self._path(version, key)
+        try:
+            with atomic_path(path) as temp_path:
+                with open(temp_path, "wb") as file:
+                    pickle.dump(result, file)
+        except OSError as e:
+            logger.warning(f"Could not write query cache file {path}: {e}")
+
+    def _remove_stale_files(self, version):
+        if not self.cache_dir:
+            return
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl") and not entry.name.startswith(f"{version}-"):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass